@@ -0,0 +1,128 @@
+# admin_logic.py
+import time
+import streamlit as st
+import pandas as pd
+
+import snapshot_logic
+import avatar_logic
+import scoring_logic
+import perf_logic
+import sheets_logic
+import page_logic
+
+# ---------------------------------------------------------
+# [관리자] 데이터 소스별 동기화 패널
+# ---------------------------------------------------------
+SOURCE_LABELS = {
+    'main': "메인 시트 (팔로워)",
+    'projects': "프로젝트",
+    'payouts': "주급",
+    'events': "이벤트",
+    'visitors': "방문자",
+}
+MARKET_SOURCE = 'markets'
+
+
+def format_age(timestamp):
+    if timestamp is None: return "-"
+    seconds = max(0, int(time.time() - timestamp))
+    if seconds < 60: return f"{seconds}초 전"
+    if seconds < 3600: return f"{seconds // 60}분 전"
+    if seconds < 86400: return f"{seconds // 3600}시간 전"
+    return f"{seconds // 86400}일 전"
+
+
+def format_bytes(size):
+    if size < 1024: return f"{size} B"
+    if size < 1024 * 1024: return f"{size / 1024:,.1f} KB"
+    return f"{size / 1024 / 1024:,.1f} MB"
+
+
+# 1. 소스별 상태 표
+def source_status_table(conn):
+    rows = []
+    for name, label in SOURCE_LABELS.items():
+        snapshot_logic.get_snapshot(conn, name)
+        info = snapshot_logic.status(name)
+        rows.append({
+            '소스': label,
+            '버전': (info['version'] or "-")[-8:],
+            '데이터 변경': format_age(info['updated']),
+            '마지막 확인': format_age(info['checked']),
+            '행 수': f"{info['rows']:,}",
+            '메모리': format_bytes(info['bytes']),
+        })
+
+    # 지수 페이지를 아직 아무도 열지 않았으면 엔진을 만들지 않음 (yfinance / 시세 DB 생성 방지)
+    if page_logic.is_loaded('market_logic'):
+        market = page_logic.load('market_logic').get_market_engine().status()
+    else:
+        market = {'updated': None, 'refreshing': False, 'rows': "-"}
+    rows.append({
+        '소스': "시장 지수",
+        '버전': "-",
+        '데이터 변경': format_age(market['updated']),
+        '마지막 확인': "갱신 중" if market['refreshing'] else format_age(market['updated']),
+        '행 수': f"{market['rows']:,}" if market['rows'] != "-" else "-",
+        '메모리': "-",
+    })
+    return pd.DataFrame(rows)
+
+
+# 2. 소스 하나만 새로 가져오기 (새 버전은 파생 캐시를 미리 채운 뒤 교체됨)
+def refresh_source(conn, name):
+    if name == MARKET_SOURCE:
+        page_logic.load('market_logic').get_market_engine().refresh()
+        return None
+    before = snapshot_logic.get_version(conn, name)
+    return snapshot_logic.refresh_snapshot(conn, name) != before
+
+
+def render_sync_panel(conn):
+    st.subheader("🔄 데이터 동기화")
+    st.caption("소스별로 새로 가져옵니다. 내용이 바뀐 경우에만 새 버전으로 교체되며, 교체 전까지는 기존 데이터를 계속 제공합니다.")
+
+    options = {**SOURCE_LABELS, MARKET_SOURCE: "시장 지수"}
+    cols = st.columns(len(options))
+    for col, (name, label) in zip(cols, options.items()):
+        with col:
+            if st.button(label, key=f"sync_{name}", use_container_width=True):
+                with st.spinner(f"{label} 동기화 중..."):
+                    try:
+                        changed = refresh_source(conn, name)
+                        result = {True: "새 버전으로 교체", False: "변경 없음", None: "갱신 완료"}[changed]
+                        st.toast(f"{label}: {result}")
+                    except Exception as e:
+                        st.error(f"{label} 동기화 실패: {e}")
+
+    st.dataframe(source_status_table(conn), hide_index=True, use_container_width=True)
+
+    st.markdown("**시트 API 호출 (워크시트별)**")
+    st.dataframe(sheets_logic.get_client(conn).counter_table(), hide_index=True, use_container_width=True)
+
+
+# 3. 성능 대시보드 (페이지/단계별 지연 분포 + 캐시 적중률)
+def render_perf_panel():
+    st.subheader("⏱️ 렌더링 성능")
+    st.caption(f"프로세스 시작 이후 (페이지, 단계)별 최근 {perf_logic.RING_SIZE}건 기준 (ms)")
+    st.dataframe(perf_logic.stage_table(), hide_index=True, use_container_width=True)
+
+    st.markdown("**캐시 적중률**")
+    st.dataframe(perf_logic.cache_table(), hide_index=True, use_container_width=True)
+
+    st.markdown("**프로젝트 점수 계산**")
+    scoring = dict(scoring_logic.get_scoring_engine().stats)
+    st.dataframe(pd.DataFrame([{
+        '전체 계산': scoring['full'], '부분 재계산': scoring['partial'], '계산한 행 수': scoring['rows'],
+    }]), hide_index=True, use_container_width=True)
+
+    st.markdown("**프로필 썸네일**")
+    avatars = avatar_logic.stats()
+    st.dataframe(pd.DataFrame([{
+        '파일 수': avatars['files'], '디스크': format_bytes(avatars['bytes']),
+        '받는 중': avatars['pending'], '실패 (재시도 대기)': avatars['failed'],
+    }]), hide_index=True, use_container_width=True)
+
+    if st.button("측정값 초기화", key="perf_reset"):
+        perf_logic.reset()
+        st.rerun()
@@ -1,35 +1,29 @@
 import streamlit as st
 from streamlit_gsheets import GSheetsConnection
 import pandas as pd
-import plotly.express as px
-import numpy as np
-import html 
-import base64
-import os
-from datetime import datetime, timedelta, timezone
-
-# [모듈 불러오기]
-import market_logic 
+
+# [모듈 불러오기] 모든 페이지가 쓰는 모듈만 여기서 import
+# 페이지별 모듈(plotly, yfinance 등 포함)은 page_logic이 메뉴를 처음 열 때 불러옴
 import visitor_logic
-import event_logic 
-import twitter_logic
-import payout_logic
-import follower_logic
-import project_logic 
+import snapshot_logic
+import asset_logic
+import ticker_logic
+import schema_logic
+import identity_logic
+import perf_logic
+import page_logic
 
 # ---------------------------------------------------------
 # [기능] 배너 설정 관리
 # ---------------------------------------------------------
 CONFIG_FILE = 'banner_config.txt'
+banner_config = asset_logic.get_flag_config(CONFIG_FILE, default=True)
 
 def load_banner_state():
-    if not os.path.exists(CONFIG_FILE): return True
-    try:
-        with open(CONFIG_FILE, 'r') as f: return f.read().strip() == 'ON'
-    except: return True
+    return banner_config.get()
 
 def save_banner_state(is_on):
-    with open(CONFIG_FILE, 'w') as f: f.write('ON' if is_on else 'OFF')
+    banner_config.set(is_on)
 
 # 1. 페이지 설정
 st.set_page_config(page_title="Raoni Map", layout="wide")
@@ -256,12 +250,11 @@ st.markdown("""
 
 # 3. 데이터 로드 (전역 캐싱)
 conn = st.connection("gsheets", type=GSheetsConnection)
-total_visitors, today_visitors = visitor_logic.update_visitor_count(conn)
 
-@st.cache_data(ttl="30m") 
-def get_sheet_data():
+# 시트 원본은 스냅샷 저장소에서 읽고, 정제 결과는 스냅샷 버전별로 한 번만 만들어 세션 간 공유
+def clean_sheet_data(raw_df):
     try:
-        df = conn.read(ttl="0") 
+        df = raw_df.copy()
         if df is not None and not df.empty:
             df['followers'] = pd.to_numeric(df['followers'], errors='coerce').fillna(0)
             cols_to_check = ['handle', 'name', 'category', 'recent_interest', 'note']
@@ -273,7 +266,31 @@ def get_sheet_data():
         return df
     except: return pd.DataFrame(columns=['handle', 'name', 'followers', 'category', 'recent_interest', 'note'])
 
-df = get_sheet_data()
+def build_sheet_data(version, raw_df):
+    df = schema_logic.share(schema_logic.load_shared('main', version, lambda: clean_sheet_data(raw_df)))
+    identity_logic.get_identity_index(version, df)
+    return df
+
+# 버전과 프레임을 한 번에 읽어 함께 넘김 (따로 읽으면 그 사이 교체된 새 버전 키에 이전 데이터가 캐싱될 수 있음)
+def get_sheet_data():
+    version, raw_df = snapshot_logic.get_snapshot(conn, 'main')
+    return version, build_sheet_data(version, raw_df)
+
+# 새 시트 버전이 들어오면 교체 전에 정제 + 계정 인덱스를 미리 생성
+snapshot_logic.register_prewarm('main', build_sheet_data)
+# 페이지 모듈이 쓰는 시트는 여기서만 등록 (해당 페이지를 한 번 연 뒤부터 새 버전을 미리 계산)
+snapshot_logic.register_prewarm('projects', page_logic.when_loaded('project_logic', 'build_project_data'))
+snapshot_logic.register_prewarm('payouts', page_logic.when_loaded('payout_logic', 'build_payout_data'))
+snapshot_logic.register_prewarm('events', page_logic.when_loaded('event_logic', 'build_event_data'))
+
+# 프로세스 시작 시 1회: 모든 워크시트를 동시에 불러오고 파생 캐시까지 생성 (가장 느린 시트 하나만큼만 대기)
+with perf_logic.stage('app', 'warm_up'):
+    snapshot_logic.warm_up(conn)
+
+with perf_logic.stage('app', 'visitors'):
+    total_visitors, today_visitors = visitor_logic.update_visitor_count(conn)
+with perf_logic.stage('app', 'sheet_data'):
+    sheet_version, df = get_sheet_data()
 
 # 4. 사이드바 구성
 with st.sidebar:
@@ -313,24 +330,9 @@ with menu_placeholder.container():
 # ---------------------------------------------------------
 # [뉴스 티커] 실시간 데이터 반영
 # ---------------------------------------------------------
-ticker_messages = []
-if not df.empty and 'recent_interest' in df.columns:
-    valid_df = df[df['recent_interest'].str.strip() != ""]
-    for _, row in valid_df.iterrows():
-        safe_name = html.escape(str(row['name']))
-        safe_handle = html.escape(str(row['handle']))
-        safe_interest = html.escape(str(row['recent_interest']))
-        msg = f"<span class='ticker-highlight'>{safe_name}</span> <span class='ticker-handle'>(@{safe_handle})</span> {safe_interest}"
-        ticker_messages.append(msg)
-
-if not ticker_messages:
-    ticker_messages = [
-        "🚀 <span class='ticker-highlight'>Raoni Map</span>에 오신 것을 환영합니다.",
-        "📢 트위터 팔로워 데이터는 매일 업데이트 됩니다.",
-        "💰 주급 맵에서 최신 수익 인증 내역을 확인하세요."
-    ]
-
-ticker_items_html = "".join([f'<div class="ticker-item">{msg}</div>' for msg in ticker_messages])
+with perf_logic.stage('app', 'ticker'):
+    # df와 함께 읽은 버전으로 캐싱 (다시 읽으면 교체 직후 이전 티커가 새 버전에 고정될 수 있음)
+    ticker_items_html = ticker_logic.build_ticker_items(sheet_version, df)
 
 st.markdown(f"""
     <div class="ticker-container">
@@ -347,40 +349,34 @@ show_banner = load_banner_state()
 banner_img_path = "images/banner.png"  
 banner_link = "https://t.me/Raoni1/17221"
 
-if show_banner and os.path.exists(banner_img_path):
+if show_banner:
     try:
-        with open(banner_img_path, "rb") as f:
-            img_data = f.read()
-            b64_img = base64.b64encode(img_data).decode()
-        
-        st.markdown(f"""
-            <a href="{banner_link}" target="_blank" style="text-decoration: none;">
-                <div class="banner-box">
-                    <img src="data:image/png;base64,{b64_img}" class="banner-img">
-                </div>
-            </a>
-        """, unsafe_allow_html=True)
+        # 인코딩된 이미지는 프로세스 메모리에 캐싱 (파일이 바뀔 때만 다시 인코딩)
+        banner_uri = asset_logic.get_data_uri(banner_img_path)
+        if banner_uri:
+            st.markdown(f"""
+                <a href="{banner_link}" target="_blank" style="text-decoration: none;">
+                    <div class="banner-box">
+                        <img src="{banner_uri}" class="banner-img">
+                    </div>
+                </a>
+            """, unsafe_allow_html=True)
     except Exception as e:
         pass
 
 # ==========================================
 # 페이지 렌더링
 # ==========================================
-if menu == "트위터 팔로워 맵":
-    if 'df' not in locals() or df.empty: df = get_sheet_data()
-    follower_logic.render_follower_page(conn, df)
-elif menu == "크립토 플젝맵":
-    if 'df' not in locals() or df.empty: df = get_sheet_data()
-    project_logic.render_project_page(conn, df)
-elif menu == "트위터 주급 맵":
-    if 'df' not in locals() or df.empty: df = get_sheet_data()
-    payout_logic.render_payout_page(conn, df)
-elif menu == "실시간 트위터": twitter_logic.render_twitter_page()
-elif menu == "지수 비교 (Indices)": market_logic.render_market_page()
-elif menu == "텔레그램 이벤트": event_logic.render_event_page(conn)
-elif menu == "관리자 페이지" and is_admin:
-    st.title("🛠️ 관리자 대시보드"); st.info("관리자 모드"); st.divider()
-    if st.button("🔄 데이터 동기화", type="primary"): st.cache_data.clear(); st.rerun()
+# 페이지 전체 렌더링 시간 (메뉴별)
+with perf_logic.stage(menu, 'render'):
+    if menu in page_logic.PAGES:
+        page_logic.render(menu, conn, lambda: (sheet_version, df) if not df.empty else get_sheet_data())
+    elif menu == "관리자 페이지" and is_admin:
+        admin_logic = page_logic.load('admin_logic')
+        st.title("🛠️ 관리자 대시보드"); st.info("관리자 모드"); st.divider()
+        admin_logic.render_sync_panel(conn)
+        st.divider()
+        admin_logic.render_perf_panel()
 
 
 
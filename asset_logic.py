@@ -0,0 +1,107 @@
+# asset_logic.py
+import os
+import time
+import base64
+import hashlib
+import mimetypes
+import threading
+
+# ---------------------------------------------------------
+# [정적 자원] 인코딩 결과를 프로세스 메모리에 보관
+# ---------------------------------------------------------
+CHECK_INTERVAL = 10  # 파일 변경 여부 확인 주기 (초) - 그 사이 rerun은 파일시스템을 건드리지 않음
+
+_lock = threading.Lock()
+_assets = {}  # path -> {'checked', 'stamp', 'digest', 'uri'}
+_configs = {}  # path -> FlagConfig
+
+
+def _file_stamp(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+# 1. 이미지 -> data URI (mtime/크기가 바뀌고 내용 해시도 바뀐 경우에만 다시 인코딩)
+def get_data_uri(path):
+    now = time.monotonic()
+    with _lock:
+        entry = _assets.get(path)
+        if entry and now - entry['checked'] < CHECK_INTERVAL:
+            return entry['uri']
+
+    try:
+        stamp = _file_stamp(path)
+    except OSError:
+        with _lock:
+            _assets.pop(path, None)
+        return None
+
+    if entry and entry['stamp'] == stamp:
+        with _lock:
+            entry['checked'] = now
+        return entry['uri']
+
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+
+    if entry and entry['digest'] == digest:
+        uri = entry['uri']
+    else:
+        mime = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        uri = f"data:{mime};base64,{base64.b64encode(data).decode()}"
+
+    with _lock:
+        _assets[path] = {'checked': now, 'stamp': stamp, 'digest': digest, 'uri': uri}
+    return uri
+
+
+# 2. ON/OFF 설정 파일 (변경되었을 때만 다시 읽는 공유 설정 객체)
+class FlagConfig:
+    def __init__(self, path, default=True):
+        self.path = path
+        self.default = default
+        self._lock = threading.Lock()
+        self._value = default
+        self._stamp = None
+        self._checked = None
+
+    def _reload(self):
+        now = time.monotonic()
+        if self._checked is not None and now - self._checked < CHECK_INTERVAL:
+            return
+        self._checked = now
+        try:
+            stamp = _file_stamp(self.path)
+        except OSError:
+            self._stamp, self._value = None, self.default
+            return
+        if stamp == self._stamp:
+            return
+        try:
+            with open(self.path, 'r') as f:
+                self._value = f.read().strip() == 'ON'
+            self._stamp = stamp
+        except OSError:
+            self._value = self.default
+
+    def get(self):
+        with self._lock:
+            self._reload()
+            return self._value
+
+    def set(self, is_on):
+        with self._lock:
+            with open(self.path, 'w') as f:
+                f.write('ON' if is_on else 'OFF')
+            self._value = is_on
+            self._stamp = _file_stamp(self.path)
+            self._checked = time.monotonic()
+
+
+# app.py는 rerun마다 다시 실행되므로 설정 객체는 이 모듈에서 공유
+def get_flag_config(path, default=True):
+    with _lock:
+        if path not in _configs:
+            _configs[path] = FlagConfig(path, default)
+        return _configs[path]
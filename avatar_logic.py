@@ -0,0 +1,189 @@
+# avatar_logic.py
+import io
+import os
+import re
+import time
+import hashlib
+import logging
+import threading
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import streamlit as st
+from PIL import Image, ImageOps
+
+import identity_logic
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# [설정] 프로필 이미지 프록시 / 로컬 썸네일 캐시
+# ---------------------------------------------------------
+SOURCE_URL = "https://unavatar.io/twitter/"
+AVATAR_DIR = os.path.join('static', 'avatars')  # Streamlit 정적 파일 폴더 (server.enableStaticServing)
+STATIC_PATH = "app/static/avatars/"       # server.baseUrlPath 아래 경로
+THUMB_SIZE = 80                     # 40px 표시 x 2 (고해상도 화면)
+CACHE_MAX_BYTES = 50 * 1024 * 1024  # 디스크 사용 상한 (넘으면 오래 안 쓴 것부터 삭제)
+FETCH_TIMEOUT = 5
+MAX_WORKERS = 4
+RETRY_SECONDS = 3600                # 실패한 계정은 1시간 뒤 재시도
+
+# 아직 받아오지 못했거나 실패한 계정용 (외부 요청 없음)
+PLACEHOLDER_URL = (
+    "data:image/svg+xml;utf8,<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 40 40'>"
+    "<rect width='40' height='40' fill='%23333'/><circle cx='20' cy='15' r='7' fill='%236B7280'/>"
+    "<path d='M6 38c2-8 8-12 14-12s12 4 14 12z' fill='%236B7280'/></svg>"
+)
+
+FILE_PATTERN = re.compile(r'^([a-z0-9_]+)\.([0-9a-f]{8})\.webp$')
+
+
+# 1. 원본 이미지 가져오기 (교체 가능)
+class HttpFetcher:
+    def __init__(self, base_url=SOURCE_URL, timeout=FETCH_TIMEOUT):
+        self.base_url = base_url
+        self.timeout = timeout
+
+    def fetch(self, key):
+        request = urllib.request.Request(self.base_url + key, headers={'User-Agent': 'Mozilla/5.0'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return response.read()
+
+
+class LocalFetcher:
+    # 테스트/오프라인용: 폴더의 {key}.png / .jpg 파일을 원본으로 사용
+    def __init__(self, directory=None):
+        self.directory = directory or os.environ.get("AVATAR_LOCAL_DIR", os.path.join('images', 'avatars'))
+
+    def fetch(self, key):
+        for ext in ('png', 'jpg', 'jpeg', 'webp'):
+            path = os.path.join(self.directory, f"{key}.{ext}")
+            if os.path.exists(path):
+                with open(path, 'rb') as f: return f.read()
+        raise FileNotFoundError(key)
+
+
+FETCHERS = {'http': HttpFetcher, 'local': LocalFetcher}
+
+
+def static_url():
+    # 루트 기준 URL (하위 경로 배포 / 중첩 경로에서도 깨지지 않도록 baseUrlPath 반영)
+    base = (st.get_option("server.baseUrlPath") or "").strip("/")
+    return "/" + (f"{base}/" if base else "") + STATIC_PATH
+
+
+# 2. 썸네일 변환 (정사각형으로 자른 뒤 축소, WebP)
+def make_thumbnail(data, size=THUMB_SIZE):
+    with Image.open(io.BytesIO(data)) as image:
+        image = ImageOps.fit(image.convert('RGB'), (size, size), Image.LANCZOS)
+        out = io.BytesIO()
+        image.save(out, format='WEBP', quality=80)
+        return out.getvalue()
+
+
+def avatar_keys(handles):
+    # 정규화 핸들에서 파일명에 쓸 수 없는 문자 제거
+    return identity_logic.normalize_handle(handles).str.replace(r'[^a-z0-9_]', '', regex=True)
+
+
+# 3. 디스크 LRU 캐시 (파일명에 내용 해시 -> 같은 URL은 내용이 바뀌지 않음)
+class AvatarCache:
+    def __init__(self, fetcher, directory=AVATAR_DIR, max_bytes=CACHE_MAX_BYTES, size=THUMB_SIZE, max_workers=MAX_WORKERS,
+                 url_prefix=None):
+        self.fetcher = fetcher
+        self.directory = directory
+        self.url_prefix = url_prefix if url_prefix is not None else static_url()
+        self.max_bytes = max_bytes
+        self.size = size
+        self._lock = threading.Lock()
+        self._files = OrderedDict()  # key -> (파일명, 크기), 오래 안 쓴 순
+        self._bytes = 0
+        self._pending = set()
+        self._failed = {}  # key -> 실패 시각
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="avatar")
+        self._scan()
+
+    def _scan(self):
+        os.makedirs(self.directory, exist_ok=True)
+        entries = []
+        for name in os.listdir(self.directory):
+            match = FILE_PATTERN.match(name)
+            if not match: continue
+            stat = os.stat(os.path.join(self.directory, name))
+            entries.append((stat.st_mtime, match.group(1), name, stat.st_size))
+        for _, key, name, size in sorted(entries):
+            self._files[key] = (name, size)
+            self._bytes += size
+        # 상한을 줄여 재시작한 경우
+        self._evict()
+
+    def _evict(self):
+        # 호출하는 쪽에서 _lock 보유
+        while self._bytes > self.max_bytes and len(self._files) > 1:
+            key, (name, size) = self._files.popitem(last=False)
+            self._bytes -= size
+            try: os.remove(os.path.join(self.directory, name))
+            except OSError: pass
+
+    def _fetch(self, key):
+        try:
+            thumb = make_thumbnail(self.fetcher.fetch(key), self.size)
+            name = f"{key}.{hashlib.sha256(thumb).hexdigest()[:8]}.webp"
+            path = os.path.join(self.directory, name)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f: f.write(thumb)
+            os.replace(tmp_path, path)
+            with self._lock:
+                old = self._files.pop(key, None)
+                if old is not None:
+                    self._bytes -= old[1]
+                    if old[0] != name:
+                        try: os.remove(os.path.join(self.directory, old[0]))
+                        except OSError: pass
+                self._files[key] = (name, len(thumb))
+                self._bytes += len(thumb)
+                self._evict()
+        except Exception as e:
+            logger.info("avatar fetch failed (%s): %s", key, e)
+            with self._lock: self._failed[key] = time.time()
+        finally:
+            with self._lock: self._pending.discard(key)
+
+    # 4. 핸들 컬럼 -> 이미지 URL 컬럼 (없는 계정은 placeholder 후 백그라운드로 받아옴)
+    def urls(self, handles):
+        keys = avatar_keys(handles)
+        now = time.time()
+        result = []
+        with self._lock:
+            for key in keys:
+                entry = self._files.get(key)
+                if entry is not None:
+                    self._files.move_to_end(key)
+                    result.append(self.url_prefix + entry[0])
+                    continue
+                result.append(PLACEHOLDER_URL)
+                if not key or key in self._pending or now - self._failed.get(key, 0) < RETRY_SECONDS:
+                    continue
+                self._pending.add(key)
+                self._pool.submit(self._fetch, key)
+        return pd.Series(result, index=handles.index, dtype=object)
+
+    def stats(self):
+        with self._lock:
+            return {'files': len(self._files), 'bytes': self._bytes, 'pending': len(self._pending), 'failed': len(self._failed)}
+
+
+# 프로세스당 1개 (AVATAR_FETCHER 환경변수로 원본 교체: http / local)
+@st.cache_resource
+def get_avatar_cache():
+    fetcher = FETCHERS[os.environ.get("AVATAR_FETCHER", "http")]()
+    return AvatarCache(fetcher)
+
+
+def avatar_urls(handles):
+    return get_avatar_cache().urls(handles)
+
+
+def stats():
+    return get_avatar_cache().stats()
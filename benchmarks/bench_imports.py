@@ -0,0 +1,145 @@
+# benchmarks/bench_imports.py
+# import 시간 벤치마크 (python -X importtime, 매 측정마다 새 프로세스)
+#   python benchmarks/bench_imports.py [--repeat 5] [--top 8] [--out 결과.json]
+# startup = app.py가 맨 위에서 import하는 모듈 (모든 페이지 공통)
+# eager   = 예전처럼 페이지 모듈까지 전부 import한 경우
+# 페이지별 = startup을 불러온 상태에서 해당 페이지 모듈을 처음 열 때 추가로 드는 시간
+# yfinance = 시장 지수를 처음 실제로 조회할 때 불러오는 의존성
+import argparse
+import ast
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+FIXTURE_DIR = os.path.join(BENCH_DIR, 'fixtures')
+RESULT_DIR = os.path.join(BENCH_DIR, 'results')
+
+sys.path.insert(0, REPO_DIR)
+import page_logic  # noqa: E402
+
+MARK = "--bench-imports-mark--"
+ADMIN_MODULE = 'admin_logic'
+LAZY_DEPENDENCIES = {'yfinance': 'market_logic'}  # 모듈 import 시점이 아니라 처음 쓸 때 불러오는 의존성 -> 쓰는 모듈
+
+
+# ---------------------------------------------------------
+# 1. 측정 대상
+# ---------------------------------------------------------
+def startup_modules():
+    # app.py 최상위 import 목록 (코드를 바꾸면 자동으로 따라감)
+    with open(os.path.join(REPO_DIR, 'app.py'), encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def page_modules():
+    return list(dict.fromkeys([module for module, _, _ in page_logic.PAGES.values()] + [ADMIN_MODULE]))
+
+
+# ---------------------------------------------------------
+# 2. 한 번 측정 (MARK 이후에 찍힌 줄만 targets의 비용으로 집계)
+# ---------------------------------------------------------
+def parse_importtime(stderr):
+    # "import time: self [us] | cumulative | imported package" -> 최상위 항목만 (하위 import는 이름 앞 들여쓰기)
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if name.startswith("  "):
+            continue
+        entries.append((name.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def run_once(preload, targets):
+    code = "; ".join([f"import {m}" for m in preload] + [f"import sys; sys.stderr.write({MARK!r} + '\\n')"] + [f"import {m}" for m in targets])
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join([FIXTURE_DIR, REPO_DIR]), 'AVATAR_FETCHER': 'local'}
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=REPO_DIR, env=env,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr[-2000:])
+        raise SystemExit(f"import failed: {targets}")
+    _, _, after = proc.stderr.partition(MARK)
+    return parse_importtime(after)
+
+
+def measure(name, preload, targets, repeat, top):
+    runs = [run_once(preload, targets) for _ in range(repeat)]
+    totals = [sum(cumulative for _, _, cumulative in entries) / 1000 for entries in runs]
+    # 가장 무거운 최상위 패키지 (중앙값 측정 기준)
+    median_run = runs[totals.index(sorted(totals)[len(totals) // 2])]
+    heaviest = sorted(median_run, key=lambda e: -e[2])[:top]
+    return {
+        'case': name,
+        'targets': targets,
+        'median_ms': round(statistics.median(totals), 1),
+        'min_ms': round(min(totals), 1),
+        'modules': len(median_run),
+        'heaviest': [{'module': module, 'cumulative_ms': round(cumulative / 1000, 1)} for module, _, cumulative in heaviest],
+    }
+
+
+# ---------------------------------------------------------
+# 3. 전체 실행 + JSON 저장
+# ---------------------------------------------------------
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=8)
+    parser.add_argument('--out')
+    args = parser.parse_args()
+
+    startup = startup_modules()
+    pages = page_modules()
+    cases = [
+        ('startup', [], startup),
+        ('eager', [], startup + pages),
+    ] + [(module, startup, [module]) for module in pages]
+    cases += [(dep, startup + [owner], [dep]) for dep, owner in LAZY_DEPENDENCIES.items()]
+
+    commit = git_commit()
+    report = {
+        'commit': commit,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'repeat': args.repeat,
+        'results': [],
+    }
+
+    print(f"{'case':<16} {'median(ms)':>10} {'min(ms)':>8} {'modules':>8}  heaviest")
+    for name, preload, targets in cases:
+        r = measure(name, preload, targets, args.repeat, args.top)
+        report['results'].append(r)
+        heaviest = ", ".join(f"{h['module']} {h['cumulative_ms']:.0f}" for h in r['heaviest'][:4])
+        print(f"{name:<16} {r['median_ms']:>10.1f} {r['min_ms']:>8.1f} {r['modules']:>8}  {heaviest}")
+
+    out = args.out or os.path.join(RESULT_DIR, f"bench_imports_{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nsaved: {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/bench_memory.py
+# 팔로워 시트 메모리 비교: 기존 정제(st.cache_data, 세션마다 사본) vs 스키마 변환 + 공유(st.cache_resource)
+#   python benchmarks/bench_memory.py [행 수] [세션 수]
+import os
+import pickle
+import sys
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import schema_logic  # noqa: E402
+
+CATEGORIES = ["크립토", "AI", "경제", "정치", "연예", "스포츠", "게임", "IT", "투자", "기타"]
+
+
+def make_sheet(n, seed=0):
+    # conn.read() 결과처럼 문자열은 object, 숫자는 float
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'handle': pd.Series([f"user_{i}" for i in range(n)], dtype=object),
+        'name': pd.Series([f"이름 {i}" for i in range(n)], dtype=object),
+        'followers': (rng.pareto(1.2, n) * 1000).round(),
+        'category': pd.Series(rng.choice(CATEGORIES, n), dtype=object),
+        'recent_interest': pd.Series(np.where(rng.random(n) < 0.3, "최근 관심사 텍스트", None), dtype=object),
+        'note': pd.Series([None] * n, dtype=object),
+    })
+
+
+# app.py의 기존 정제 로직 (컬럼을 파이썬 문자열 객체로 유지)
+def clean_legacy(raw_df):
+    df = raw_df.copy()
+    df['followers'] = pd.to_numeric(df['followers'], errors='coerce').fillna(0)
+    for col in ['handle', 'name', 'category', 'recent_interest', 'note']:
+        df[col] = df[col].fillna("").astype(str).astype(object)
+    return df
+
+
+def traced(fn):
+    tracemalloc.start()
+    result = fn()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main(n=50_000, sessions=10):
+    raw_df = make_sheet(n)
+
+    legacy = clean_legacy(raw_df)
+    compact = schema_logic.compact(clean_legacy(raw_df), 'main')
+
+    # st.cache_data: 캐시 적중마다 pickle 사본을 세션에 돌려줌
+    payload = pickle.dumps(legacy)
+    _, legacy_bytes = traced(lambda: [pickle.loads(payload) for _ in range(sessions)])
+
+    # st.cache_resource + share(): 같은 버퍼를 가리키는 얕은 사본만 생성
+    _, shared_bytes = traced(lambda: [schema_logic.share(compact) for _ in range(sessions)])
+
+    print(f"rows={n:,} sessions={sessions}")
+    print(f"{'column':<16} {'legacy dtype':<14} {'legacy(KB)':>11} {'compact dtype':<16} {'compact(KB)':>12}")
+    legacy_usage = legacy.memory_usage(deep=True, index=False)
+    compact_usage = compact.memory_usage(deep=True, index=False)
+    for col in legacy.columns:
+        print(f"{col:<16} {str(legacy[col].dtype):<14} {legacy_usage[col] / 1024:>11.0f} "
+              f"{str(compact[col].dtype):<16} {compact_usage[col] / 1024:>12.0f}")
+    print(f"{'frame total':<16} {'':<14} {legacy_usage.sum() / 1024:>11.0f} {'':<16} {compact_usage.sum() / 1024:>12.0f}")
+    print()
+    print(f"per-session memory  legacy: {legacy_bytes / sessions / 1024:,.0f} KB   "
+          f"shared: {shared_bytes / sessions / 1024:,.1f} KB")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 50_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10,
+    )
@@ -0,0 +1,198 @@
+# benchmarks/bench_pages.py
+# 페이지 렌더 파이프라인 벤치마크 (AppTest + 가짜 GSheetsConnection + 합성 시트)
+#   python benchmarks/bench_pages.py [--rows 100 1000 10000 100000] [--out 결과.json]
+# 크기마다 새 프로세스에서 실행 (프로세스 단위 캐시가 섞이지 않도록)
+import argparse
+import functools
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+FIXTURE_DIR = os.path.join(BENCH_DIR, 'fixtures')
+RESULT_DIR = os.path.join(BENCH_DIR, 'results')
+
+SIZES = [100, 1_000, 10_000, 100_000]
+PAGES = {
+    'follower': "트위터 팔로워 맵",
+    'project': "크립토 플젝맵",
+    'payout': "트위터 주급 맵",
+}
+STAGES = ['load', 'filter', 'metrics', 'treemap', 'leaderboard']
+
+
+# ---------------------------------------------------------
+# 1. 단계별 타이머 (모듈 함수를 감싸서 측정, 중첩 호출은 바깥만 기록)
+# ---------------------------------------------------------
+class StageTimer:
+    def __init__(self):
+        self.totals = {}
+        self._local = threading.local()
+
+    def reset(self):
+        self.totals = {stage: 0.0 for stage in STAGES}
+
+    def wrap(self, owner, attr, stage):
+        fn = getattr(owner, attr)
+
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            # 시작 시 일괄 로드 스레드는 페이지 렌더 시간에서 제외
+            if getattr(self._local, 'depth', 0) or threading.current_thread().name.startswith('prefetch'):
+                return fn(*args, **kwargs)
+            self._local.depth = 1
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._local.depth = 0
+                self.totals[stage] = self.totals.get(stage, 0.0) + (time.perf_counter() - start) * 1000
+
+        setattr(owner, attr, timed)
+
+
+def install_timers(timer):
+    import streamlit
+    import snapshot_logic
+    import schema_logic
+    import scoring_logic
+    import summary_logic
+    import treemap_logic
+    import ranking_logic
+
+    timer.wrap(snapshot_logic, 'get_snapshot', 'load')
+    timer.wrap(schema_logic, 'load_shared', 'load')
+    timer.wrap(scoring_logic, 'apply_scores', 'load')
+    timer.wrap(summary_logic, 'get_category_summary', 'filter')
+    timer.wrap(summary_logic.CategorySummary, 'ranking', 'filter')
+    for attr in ('count', 'total', 'top'):
+        timer.wrap(summary_logic.CategorySummary, attr, 'metrics')
+    timer.wrap(treemap_logic, 'get_figure', 'treemap')
+    timer.wrap(streamlit, 'plotly_chart', 'treemap')  # figure -> JSON 직렬화 포함
+    timer.wrap(ranking_logic, 'render_leaderboard', 'leaderboard')
+
+
+def payload_bytes(at):
+    size = sum(len(el.value.encode()) for el in at.markdown)
+    for chart in at.get('plotly_chart'):
+        size += len(chart.proto.spec.encode())
+    return size
+
+
+def max_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# ---------------------------------------------------------
+# 2. 크기 하나 측정 (하위 프로세스에서 실행)
+# ---------------------------------------------------------
+def run_worker(rows):
+    os.environ['BENCH_ROWS'] = str(rows)
+    os.environ.setdefault('AVATAR_FETCHER', 'local')
+    sys.path[:0] = [FIXTURE_DIR, REPO_DIR]
+
+    # 스냅샷 / 썸네일 / 설정 파일은 임시 폴더에 (저장소를 건드리지 않음)
+    workdir = tempfile.mkdtemp(prefix='bench_pages_')
+    os.symlink(os.path.join(REPO_DIR, 'images'), os.path.join(workdir, 'images'))
+    os.chdir(workdir)
+
+    from streamlit.testing.v1 import AppTest
+
+    timer = StageTimer()
+    install_timers(timer)
+
+    at = AppTest.from_file(os.path.join(REPO_DIR, 'app.py'), default_timeout=600)
+    at.secrets['ADMIN_PW'] = 'bench'
+
+    results = []
+
+    def measure(page, run, action):
+        timer.reset()
+        rss_before = max_rss_mb()
+        start = time.perf_counter()
+        action()
+        wall_ms = (time.perf_counter() - start) * 1000
+        if at.exception:
+            raise RuntimeError(f"{page}/{run}: {at.exception[0].value}")
+        results.append({
+            'rows': rows, 'page': page, 'run': run,
+            'wall_ms': round(wall_ms, 2),
+            'stages_ms': {stage: round(ms, 2) for stage, ms in timer.totals.items()},
+            'peak_rss_mb': round(max_rss_mb(), 1),
+            'peak_rss_growth_mb': round(max_rss_mb() - rss_before, 1),
+            'payload_bytes': payload_bytes(at),
+        })
+
+    # 첫 실행 = 프로세스 시작 (스냅샷 없음 -> 시트 일괄 로드) + 기본 페이지
+    measure('startup', 'cold', at.run)
+    for page, menu in PAGES.items():
+        measure(page, 'cold', lambda: at.sidebar.radio[0].set_value(menu).run())
+        measure(page, 'warm', at.run)
+
+    json.dump(results, sys.stdout)
+
+
+# ---------------------------------------------------------
+# 3. 전체 실행 + JSON 저장
+# ---------------------------------------------------------
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--out')
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        run_worker(args.worker)
+        return
+
+    import pandas as pd
+    import streamlit
+
+    commit = git_commit()
+    report = {
+        'commit': commit,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'streamlit': streamlit.__version__,
+        'results': [],
+    }
+
+    print(f"{'rows':>7} {'page':<9} {'run':<5} {'wall':>8} " + " ".join(f"{s:>11}" for s in STAGES) + f" {'rss(MB)':>8} {'payload':>9}")
+    for rows in args.rows:
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--worker', str(rows)],
+                              capture_output=True, text=True)
+        if proc.returncode != 0:
+            sys.stderr.write(proc.stderr[-2000:])
+            raise SystemExit(f"benchmark failed for {rows} rows")
+        for r in json.loads(proc.stdout):
+            report['results'].append(r)
+            stages = " ".join(f"{r['stages_ms'][s]:>11.1f}" for s in STAGES)
+            print(f"{r['rows']:>7} {r['page']:<9} {r['run']:<5} {r['wall_ms']:>8.1f} {stages} "
+                  f"{r['peak_rss_mb']:>8.1f} {r['payload_bytes']:>9,}")
+
+    out = args.out or os.path.join(RESULT_DIR, f"bench_pages_{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nsaved: {out}")
+
+
+if __name__ == "__main__":
+    main()
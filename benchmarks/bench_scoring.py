@@ -0,0 +1,52 @@
+# benchmarks/bench_scoring.py
+# 마인드쉐어 산식 비교: 계산 시간, 선형 산식 대비 순위 상관, 상위 N 겹침
+#   python benchmarks/bench_scoring.py [행 수]
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import scoring_logic  # noqa: E402
+
+TOP_N = 20
+
+
+def make_projects(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'join_key': [f"acc{i}" for i in range(n)],
+        'mentions': rng.pareto(1.5, n) * 10,
+        'views': rng.pareto(1.2, n) * 1000,
+    })
+
+
+def main(n=10_000):
+    df = make_projects(n)
+    baseline = None
+    print(f"{'scorer':<8} {'full(ms)':>9} {'incr(ms)':>9} {'spearman':>9} {'top%d' % TOP_N:>6}")
+    for name in scoring_logic.SCORERS:
+        engine = scoring_logic.ScoringEngine()
+        start = time.perf_counter()
+        scores = engine.score(df, 'v1', scorer=name)
+        full_ms = (time.perf_counter() - start) * 1000
+
+        # 1% 행만 바뀐 다음 버전 (최댓값은 유지)
+        changed = df.copy()
+        rows = changed.sample(frac=0.01, random_state=1).index
+        changed.loc[rows, 'mentions'] = np.minimum(changed.loc[rows, 'mentions'] * 1.1, df['mentions'].max())
+        start = time.perf_counter()
+        engine.score(changed, 'v2', scorer=name)
+        incr_ms = (time.perf_counter() - start) * 1000
+
+        rank = scores['raw_score'].rank(ascending=False)
+        if baseline is None: baseline = rank
+        spearman = np.corrcoef(rank, baseline)[0, 1]
+        top = set(rank.nsmallest(TOP_N).index) & set(baseline.nsmallest(TOP_N).index)
+        print(f"{name:<8} {full_ms:>9.2f} {incr_ms:>9.2f} {spearman:>9.3f} {len(top):>6}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,76 @@
+# benchmarks/bench_treemap.py
+# px.treemap vs treemap_logic.two_level_treemap (팔로워 맵과 같은 입력)
+#   python benchmarks/bench_treemap.py [계정 수 ...]
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import treemap_logic  # noqa: E402
+
+SIZES = [1_000, 10_000, 100_000]
+CATEGORIES = ["크립토", "주식", "AI", "게임", "NFT", "매크로"]
+
+
+def make_accounts(n, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'handle': [f"user{i}" for i in range(n)],
+        'name': [f"User {i}" for i in range(n)],
+        'followers': rng.integers(1, 1_000_000, n).astype(float),
+        'category': rng.choice(CATEGORIES, n),
+    })
+    df['chart_label'] = treemap_logic.label_series(df['name'], "@" + df['handle'])
+    df['log_followers'] = np.log10(df['followers'])
+    return df
+
+
+def build_px(df):
+    return px.treemap(
+        df, path=['category', 'chart_label'], values='followers', color='log_followers',
+        custom_data=['name'], color_continuous_scale=treemap_logic.COLOR_SCALE, template="plotly_dark"
+    )
+
+
+def build_direct(df):
+    return treemap_logic.two_level_treemap(
+        df['category'], df['chart_label'], df['followers'], df['log_followers'], custom_data=df[['name']]
+    )
+
+
+def timed(fn, df, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fig = fn(df)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, fig
+
+
+def same_tree(a, b):
+    ta, tb = a.data[0], b.data[0]
+    oa, ob = np.argsort(ta.ids), np.argsort(tb.ids)
+    return (
+        np.array_equal(np.asarray(ta.ids)[oa], np.asarray(tb.ids)[ob])
+        and np.array_equal(np.asarray(ta.parents)[oa], np.asarray(tb.parents)[ob])
+        and np.allclose(np.asarray(ta.values)[oa], np.asarray(tb.values)[ob])
+        and np.allclose(np.asarray(ta.marker.colors, dtype=float)[oa], np.asarray(tb.marker.colors, dtype=float)[ob])
+    )
+
+
+def main(sizes):
+    print(f"{'accounts':>9} {'px(ms)':>10} {'direct(ms)':>11} {'speedup':>8} {'same':>5}")
+    for n in sizes:
+        df = make_accounts(n)
+        repeat = 3 if n <= 10_000 else 1
+        px_ms, px_fig = timed(build_px, df, repeat)
+        direct_ms, direct_fig = timed(build_direct, df, repeat)
+        print(f"{n:>9,} {px_ms:>10.1f} {direct_ms:>11.1f} {px_ms / direct_ms:>7.1f}x {str(same_tree(px_fig, direct_fig)):>5}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or SIZES)
@@ -0,0 +1,79 @@
+# benchmarks/fixtures/streamlit_gsheets/__init__.py
+# 벤치마크용 가짜 GSheetsConnection (네트워크 없이 합성 시트 반환)
+#   BENCH_ROWS        : 계정 수 (메인 / 프로젝트 / 주급 시트 공통)
+#   BENCH_SHEET_DELAY : 시트 읽기 1회당 지연 (초, API 지연 흉내)
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from streamlit.connections import BaseConnection
+
+CATEGORIES = ["크립토", "주식", "AI", "게임", "NFT", "매크로", "경제", "IT"]
+
+CALLS = []  # (동작, 워크시트)
+
+
+def _rows():
+    return int(os.environ.get("BENCH_ROWS", "1000"))
+
+
+def make_main(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'handle': [f"user{i}" for i in range(n)],
+        'name': [f"User {i}" if i % 11 else "" for i in range(n)],
+        'followers': (rng.pareto(1.2, n) * 1000).round(),
+        'category': rng.choice(CATEGORIES, n),
+        'recent_interest': np.where(rng.random(n) < 0.2, "최근 관심 <뉴스> & 이슈", None),
+        'note': np.where(rng.random(n) < 0.1, "메모", None),
+        'bio': np.where(rng.random(n) < 0.5, "자기소개 텍스트", None),
+    })
+
+
+def make_projects(n, seed=1):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        '카테고리': rng.choice(CATEGORIES, n),
+        '계정': [f"@User{i}" for i in rng.permutation(n)],
+        '언급횟수': (rng.pareto(1.5, n) * 10).round().astype(int).astype(str),
+        '총조회수': [f"{v:,}" for v in (rng.pareto(1.2, n) * 1000).round().astype(int)],
+        '비고': np.where(rng.random(n) < 0.3, "프로젝트 설명", None),
+    })
+
+
+def make_payouts(n, seed=2):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'handle': [f"user{i}" for i in rng.permutation(n)],
+        'name': [f"User {i}" for i in range(n)],
+        'payout_amount': [f"{v:,}" for v in (rng.pareto(1.3, n) * 100).round().astype(int)],
+        'category': rng.choice(CATEGORIES, n),
+        'bio': np.where(rng.random(n) < 0.3, "수익 인증", None),
+    })
+
+
+SHEETS = {
+    None: lambda: make_main(_rows()),
+    'projects': lambda: make_projects(_rows()),
+    'payouts': lambda: make_payouts(_rows()),
+    'events': lambda: pd.DataFrame({
+        'event_name': ["이벤트"], 'prizes': ["상품"], 'deadline': ["2026-01-01"],
+        'announce_date': ["2026-01-02"], 'link': ["https://example.com"],
+    }),
+    'visitors': lambda: pd.DataFrame({'total': ["1,000"], 'today': [10], 'last_date': ["2026-01-01"]}),
+}
+
+
+class GSheetsConnection(BaseConnection):
+    def _connect(self, **kwargs):
+        return None
+
+    def read(self, worksheet=None, ttl=None, **kwargs):
+        CALLS.append(('read', worksheet))
+        time.sleep(float(os.environ.get("BENCH_SHEET_DELAY", "0")))
+        return SHEETS[worksheet]()
+
+    def update(self, worksheet=None, data=None, **kwargs):
+        CALLS.append(('update', worksheet))
+        return data
@@ -1,27 +1,33 @@
 # event_logic.py
 import streamlit as st
 import pandas as pd
+import snapshot_logic
+import schema_logic
 
-# 1. 이벤트 데이터 가져오기 (캐시 10분)
-@st.cache_data(ttl="10m")
+REQUIRED_COLS = ['event_name', 'prizes', 'deadline', 'announce_date', 'link']
+
+
+# 1. 시트 헤더 확인 (오류 메시지 또는 None)
+#    정리 함수는 prewarm 스레드에서도 실행되고 결과가 캐싱되므로, 화면 표시는 렌더링 쪽에서
+def validate_event_data(data):
+    if data is None or data.empty:
+        return None
+    if not set(REQUIRED_COLS).issubset(data.columns):
+        return f"❌ 'events' 시트 헤더 오류! 필요 컬럼: {REQUIRED_COLS}"
+    return None
+
+
+# 이벤트 데이터 정리 (시트 버전별로 한 번만)
 def get_event_data(data):
-    # data는 app.py에서 conn.read()로 가져온 데이터프레임을 받습니다.
-    try:
-        if data is None or data.empty:
-            return pd.DataFrame()
-        
-        # 필수 컬럼 확인
-        required_cols = ['event_name', 'prizes', 'deadline', 'announce_date', 'link']
-        if not set(required_cols).issubset(data.columns):
-            st.error(f"❌ 'events' 시트 헤더 오류! 필요 컬럼: {required_cols}")
-            return pd.DataFrame()
-            
-        # 결측치 처리 (빈칸은 공백으로)
-        data = data.fillna("")
-        return data
-    except Exception as e:
-        st.error(f"데이터 로드 중 오류: {e}")
+    # data는 events 스냅샷 원본 데이터프레임을 받습니다.
+    if data is None or data.empty or validate_event_data(data):
         return pd.DataFrame()
+    # 결측치 처리 (빈칸은 공백으로)
+    return data.fillna("")
+
+def build_event_data(version, raw_df):
+    return schema_logic.share(schema_logic.load_shared('events', version, lambda: get_event_data(raw_df)))
+
 
 # 2. 이벤트 페이지 렌더링
 def render_event_page(conn):
@@ -30,8 +36,12 @@ def render_event_page(conn):
 
     try:
         # 시트 데이터 읽기
-        raw_df = conn.read(worksheet="events", ttl="10m")
-        df = get_event_data(raw_df)
+        version, raw_df = snapshot_logic.get_snapshot(conn, "events")
+        error = validate_event_data(raw_df)
+        if error:
+            st.error(error)
+            return
+        df = build_event_data(version, raw_df)
 
         if not df.empty:
             # 마감기한 순으로 정렬 (선택사항)
@@ -67,4 +77,4 @@ def render_event_page(conn):
             st.info("현재 진행 중인 이벤트가 없습니다.")
             
     except Exception as e:
-        st.error("이벤트 목록을 불러오지 못했습니다. 구글 시트 'events' 탭을 확인해주세요.")
+        st.error(f"이벤트 목록을 불러오지 못했습니다. 구글 시트 'events' 탭을 확인해주세요. ({e})")
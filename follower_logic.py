@@ -1,10 +1,46 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 import numpy as np
-import html
+import ranking_logic
+import treemap_logic
+import summary_logic
+import perf_logic
 
-def render_follower_page(conn, df):
+
+def build_follower_figure(display_df, merge_categories):
+    display_df = display_df.copy()
+    display_df['chart_label'] = treemap_logic.label_series(display_df['name'], "@" + display_df['handle'].astype(str))
+    display_df['log_followers'] = np.log10(display_df['followers'].replace(0, 1))
+
+    fig = treemap_logic.two_level_treemap(
+        "전체 (All)" if merge_categories else display_df['category'],
+        display_df['chart_label'],
+        display_df['followers'],
+        display_df['log_followers'],
+        custom_data=display_df[['name']],
+        top_n=treemap_logic.get_top_n(),
+    )
+
+    fig.update_traces(
+        texttemplate='<b>%{customdata[0]}</b><br><b style="font-size:1.2em">%{value:,.0f}</b><br><span style="font-size:0.8em; color:#D1D5DB">%{percentRoot:.1%}</span>',
+        textfont=dict(size=20, family="sans-serif", color="white"),
+        textposition="middle center",
+        marker=dict(line=dict(width=3, color='#000000')), 
+        root_color="#000000",
+        hovertemplate='<b>%{customdata[0]}</b><br><span style="color:#9CA3AF">@%{label}</span><br>Followers: %{value:,.0f}<br>Share: %{percentRoot:.1%}<extra></extra>'
+    )
+
+    fig.update_layout(
+        margin=dict(t=0, l=0, r=0, b=0), 
+        paper_bgcolor='#000000', plot_bgcolor='#000000', 
+        height=600, 
+        font=dict(family="sans-serif"), 
+        coloraxis_showscale=False,
+        hoverlabel=dict(bgcolor="#1C1F26", bordercolor="#10B981", font=dict(size=18, color="white"), namelength=-1)
+    )
+    return fig
+
+
+def render_follower_page(conn, df, version):
     # ---------------------------------------------------------
     # [CSS] 카테고리 버튼 스타일링 (알약 모양)
     # ---------------------------------------------------------
@@ -108,12 +144,12 @@ def render_follower_page(conn, df):
     st.write("") 
 
     # ---------------------------------------------------------
-    # 데이터 필터링
+    # 데이터 필터링 (데이터 버전별 요약 테이블에서 바로 조회)
     # ---------------------------------------------------------
-    if selected_category == "전체보기":
-        display_df = df[df['followers'] > 0]
-    else:
-        display_df = df[(df['category'] == selected_category) & (df['followers'] > 0)]
+    with perf_logic.stage('follower', 'filter'):
+        summary = summary_logic.get_category_summary('follower', version, df, 'followers')
+        # 팔로워 내림차순으로 이미 정렬된 행
+        display_df = summary.ranking(selected_category)
 
     if display_df.empty:
         st.info(f"'{selected_category}' 카테고리에 데이터가 없습니다.")
@@ -123,9 +159,9 @@ def render_follower_page(conn, df):
     # 상단 요약 지표
     # ---------------------------------------------------------
     col1, col2, col3 = st.columns(3)
-    total_acc = len(display_df)
-    total_fol = display_df['followers'].sum()
-    top_one = display_df.loc[display_df['followers'].idxmax()] if not display_df.empty else None
+    total_acc = summary.count(selected_category)
+    total_fol = summary.total(selected_category)
+    top_one = summary.top(selected_category)
     top_one_text = f"{top_one['name']}" if top_one is not None else "-"
 
     with col1: 
@@ -140,46 +176,12 @@ def render_follower_page(conn, df):
     # ---------------------------------------------------------
     # 2. 트리맵 차트
     # ---------------------------------------------------------
-    display_df['chart_label'] = display_df.apply(
-        lambda x: f"{str(x['name'])}<br><span style='font-size:0.7em; font-weight:normal;'>@{str(x['handle'])}</span>", 
-        axis=1
-    )
-    display_df['log_followers'] = np.log10(display_df['followers'].replace(0, 1))
-
-    if merge_categories:
-        display_df['root_group'] = "전체 (All)"
-        path_list = ['root_group', 'chart_label']
-    else:
-        path_list = ['category', 'chart_label']
-
-    fig = px.treemap(
-        display_df, 
-        path=path_list, 
-        values='followers', 
-        color='log_followers',
-        custom_data=['name'], 
-        color_continuous_scale=[(0.00, '#2E2B4E'), (0.05, '#353263'), (0.10, '#3F3C5C'), (0.15, '#464282'), (0.20, '#4A477A'), (0.25, '#4A5D91'), (0.30, '#4A6FA5'), (0.35, '#537CA8'), (0.40, '#5C8BAE'), (0.45, '#5C98AE'), (0.50, '#5E9CA8'), (0.55, '#5E9E94'), (0.60, '#5F9E7F'), (0.65, '#729E6F'), (0.70, '#859E5F'), (0.75, '#969E5F'), (0.80, '#A89E5F'), (0.85, '#AD905D'), (0.90, '#AE815C'), (0.95, '#AE6E5C'), (1.00, '#AE5C5C')],
-        template="plotly_dark"
-    )
-    
-    fig.update_traces(
-        texttemplate='<b>%{customdata[0]}</b><br><b style="font-size:1.2em">%{value:,.0f}</b><br><span style="font-size:0.8em; color:#D1D5DB">%{percentRoot:.1%}</span>',
-        textfont=dict(size=20, family="sans-serif", color="white"),
-        textposition="middle center",
-        marker=dict(line=dict(width=3, color='#000000')), 
-        root_color="#000000",
-        hovertemplate='<b>%{customdata[0]}</b><br><span style="color:#9CA3AF">@%{label}</span><br>Followers: %{value:,.0f}<br>Share: %{percentRoot:.1%}<extra></extra>'
-    )
-    
-    fig.update_layout(
-        margin=dict(t=0, l=0, r=0, b=0), 
-        paper_bgcolor='#000000', plot_bgcolor='#000000', 
-        height=600, 
-        font=dict(family="sans-serif"), 
-        coloraxis_showscale=False,
-        hoverlabel=dict(bgcolor="#1C1F26", bordercolor="#10B981", font=dict(size=18, color="white"), namelength=-1)
-    )
-    st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+    with perf_logic.stage('follower', 'treemap'):
+        fig = treemap_logic.get_figure(
+            ('follower', version, selected_category, merge_categories),
+            lambda: build_follower_figure(display_df, merge_categories)
+        )
+        st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
 
     st.write("")
     
@@ -192,73 +194,5 @@ def render_follower_page(conn, df):
     with col_toggle:
         expand_view = st.toggle("전체 펼치기", value=False, key="follower_list_toggle")
     
-    ranking_df = display_df.sort_values(by='followers', ascending=False).reset_index(drop=True)
-    view_total = ranking_df['followers'].sum()
-    
-    def clean_str(val):
-        if pd.isna(val): return ""
-        s = str(val).strip()
-        if s.lower() == 'nan': return ""
-        return s
-
-    list_html = ""
-    for index, row in ranking_df.iterrows():
-        rank = index + 1
-        medal = "🥇" if rank == 1 else "🥈" if rank == 2 else "🥉" if rank == 3 else f"{rank}"
-        img_url = f"https://unavatar.io/twitter/{row['handle']}"
-        share_pct = (row['followers'] / view_total * 100) if view_total > 0 else 0
-        
-        recent_raw = clean_str(row.get('recent_interest', ''))
-        note_raw = clean_str(row.get('note', ''))
-        recent_safe = html.escape(recent_raw)
-        note_safe = html.escape(note_raw)
-        
-        interest_html = f"<div class='rank-interest'>{recent_safe}</div>" if recent_safe else ""
-        note_html = f"<span class='rank-note'>{note_safe}</span>" if note_safe else ""
-        
-        if 'bio' not in row: bio_content = "소개글이 없습니다."
-        else: bio_content = clean_str(row['bio'])
-        if not bio_content: bio_content = "소개글이 없습니다."
-
-        # [수정됨] 마크다운 코드 블록 인식을 막기 위해 한 줄로 작성 (들여쓰기 제거)
-        expanded_recent = ""
-        if recent_safe:
-            expanded_recent = f'<div style="margin-bottom: 12px;"><div class="bio-header" style="color: #D4E157;">📌 RECENT ACTIVITY</div><div class="bio-content" style="font-weight: 500; color: #FFFFFF;">{recent_safe}</div></div>'
-
-        # 리스트 HTML 구성 (들여쓰기를 최소화하거나 주의해야 함)
-        list_html += f"""
-        <details {'open' if expand_view else ''}>
-            <summary>
-                <div class="ranking-row">
-                    <div class="rank-col-1">
-                        <div class="rank-num">{medal}</div>
-                        <img src="{img_url}" class="rank-img" onerror="this.style.display='none'">
-                    </div>
-                    <div class="rank-info">
-                        <div class="rank-name">{row['name']}</div>
-                        <div class="rank-handle">@{row['handle']}</div>
-                    </div>
-                    <div class="rank-extra">
-                        {interest_html}
-                        {note_html}
-                    </div>
-                    <div class="rank-stats-group">
-                        <div class="rank-category">{row['category']}</div>
-                        <div class="rank-share">{share_pct:.1f}%</div>
-                        <div class="rank-followers">{int(row['followers']):,}</div>
-                    </div>
-                </div>
-            </summary>
-            <div class="bio-box">
-                {expanded_recent}
-                <div class="bio-header">📝 PROFILE BIO</div>
-                <div class="bio-content">{bio_content}</div>
-                <a href="https://twitter.com/{row['handle']}" target="_blank" class="bio-link-btn">
-                    Visit Profile ↗
-                </a>
-            </div>
-        </details>
-        """
-    
-    with st.container(height=600 if not expand_view else None):
-        st.markdown(list_html, unsafe_allow_html=True)
+    with perf_logic.stage('follower', 'leaderboard'):
+        ranking_logic.render_leaderboard('follower', display_df, summary.version, selected_category, expand_view)
@@ -0,0 +1,108 @@
+# history_logic.py
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+import pandas as pd
+
+# ---------------------------------------------------------
+# [시세 저장소] 종목별 일봉/시간봉 종가를 로컬 SQLite에 누적
+# ---------------------------------------------------------
+HISTORY_DB = 'market_history.db'
+
+# 간격 -> 저장 기록이 없을 때 처음 받아올 기간
+INTERVALS = {'1d': '3mo', '1h': '5d'}
+# 간격 -> 최소 동기화 주기 (초, 0 = 갱신마다) / 시간봉은 한 시간에 한 번만 받아 갱신당 호출 수를 줄임
+SYNC_SECONDS = {'1d': 0, '1h': 3600}
+
+EPOCH = pd.Timestamp(0, tz='UTC')
+
+
+class HistoryStore:
+    def __init__(self, path=HISTORY_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._synced = {}  # (종목, 간격) -> 마지막 동기화 시각 (monotonic)
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS closes ("
+                "symbol TEXT NOT NULL, interval TEXT NOT NULL, ts INTEGER NOT NULL, close REAL NOT NULL, "
+                "PRIMARY KEY (symbol, interval, ts))"
+            )
+
+    @contextmanager
+    def _connect(self):
+        # 호출마다 따로 연결 (sqlite 연결은 스레드 간 공유 불가)
+        db = sqlite3.connect(self.path, timeout=10)
+        try:
+            with db: yield db
+        finally:
+            db.close()
+
+    # 1. 마지막 저장 시각 (초 단위 UTC)
+    def last_ts(self, symbol, interval):
+        with self._connect() as db:
+            row = db.execute("SELECT MAX(ts) FROM closes WHERE symbol = ? AND interval = ?", (symbol, interval)).fetchone()
+        return row[0] if row else None
+
+    # 2. 새 구간 추가 (마지막 봉은 장중 값이 바뀌므로 덮어쓰기)
+    def append(self, symbol, interval, hist):
+        hist = hist.dropna(subset=['Close'])
+        if hist.empty: return 0
+        index = pd.DatetimeIndex(hist.index)
+        index = index.tz_localize('UTC') if index.tz is None else index.tz_convert('UTC')
+        ts = (index - EPOCH) // pd.Timedelta(seconds=1)
+        rows = [(symbol, interval, int(t), float(c)) for t, c in zip(ts, hist['Close'])]
+        with self._lock, self._connect() as db:
+            db.executemany("INSERT OR REPLACE INTO closes (symbol, interval, ts, close) VALUES (?, ?, ?, ?)", rows)
+        return len(rows)
+
+    # 3. 종가 시계열 읽기
+    def load(self, symbol, interval='1d', since=None):
+        query = "SELECT ts, close FROM closes WHERE symbol = ? AND interval = ?"
+        params = [symbol, interval]
+        if since is not None:
+            query += " AND ts >= ?"
+            params.append(int(since))
+        with self._connect() as db:
+            rows = db.execute(query + " ORDER BY ts", params).fetchall()
+        if not rows: return pd.Series(dtype=float)
+        ts, closes = zip(*rows)
+        return pd.Series(closes, index=pd.to_datetime(ts, unit='s', utc=True), dtype=float)
+
+    # 4. 빠진 구간만 받아와 누적
+    def sync(self, provider, symbol):
+        for interval, backfill in INTERVALS.items():
+            synced = self._synced.get((symbol, interval))
+            if synced is not None and time.monotonic() - synced < SYNC_SECONDS.get(interval, 0):
+                continue
+            last = self.last_ts(symbol, interval)
+            if last is None:
+                hist = provider.history(symbol, period=backfill, interval=interval)
+            else:
+                start = pd.to_datetime(last, unit='s', utc=True)
+                hist = provider.history(symbol, start=start, interval=interval)
+            self.append(symbol, interval, hist)
+            self._synced[(symbol, interval)] = time.monotonic()
+
+
+# 5. 기간별 등락률 / 스파크라인 (로컬 데이터만 사용)
+def change_since(closes, days):
+    if len(closes) < 2: return None
+    cutoff = closes.index[-1] - pd.Timedelta(days=days)
+    base = closes[closes.index <= cutoff]
+    if base.empty: return None
+    prev = base.iloc[-1]
+    return ((closes.iloc[-1] - prev) / prev) * 100 if prev != 0 else 0
+
+
+def sparkline_svg(values, width=120, height=32, color='#10B981'):
+    if len(values) < 2: return ""
+    lo, hi = min(values), max(values)
+    span = (hi - lo) or 1
+    step = width / (len(values) - 1)
+    points = " ".join(f"{i * step:.1f},{height - (v - lo) / span * height:.1f}" for i, v in enumerate(values))
+    return (
+        f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}" preserveAspectRatio="none">'
+        f'<polyline fill="none" stroke="{color}" stroke-width="2" points="{points}"/></svg>'
+    )
@@ -0,0 +1,40 @@
+# identity_logic.py
+import pandas as pd
+import streamlit as st
+
+# ---------------------------------------------------------
+# [계정 식별] 핸들 정규화 + 팔로워 시트 기준 해시 인덱스
+# ---------------------------------------------------------
+
+# 1. 핸들 정규화 ('@Foo', 'foo ' -> 'foo') - 모든 페이지가 같은 규칙 사용
+def normalize_handle(handles):
+    return handles.fillna("").astype(str).str.replace('@', '', regex=False).str.strip().str.lower()
+
+
+# 2. 정규화 핸들 -> (name, followers, category) 인덱스
+class IdentityIndex:
+    COLUMNS = ['name', 'followers', 'category']
+
+    def __init__(self, follower_df):
+        if follower_df is None or follower_df.empty:
+            self.table = pd.DataFrame(columns=self.COLUMNS, index=pd.Index([], name='join_key'))
+            return
+        table = follower_df[self.COLUMNS].copy()
+        table['followers'] = pd.to_numeric(table['followers'], errors='coerce').fillna(0)
+        table.index = pd.Index(normalize_handle(follower_df['handle']), name='join_key')
+        # 같은 계정이 여러 번 있으면 팔로워가 가장 많은 행 기준
+        table = table.sort_values('followers', ascending=False)
+        self.table = table[~table.index.duplicated(keep='first')]
+
+    def lookup(self, handles, index=None):
+        # 핸들 컬럼을 받아 같은 순서/인덱스로 (name, followers, category) 반환 (없는 계정은 NaN)
+        keys = normalize_handle(handles)
+        matched = self.table.reindex(keys.to_numpy())
+        matched.index = handles.index if index is None else index
+        return matched
+
+
+# 데이터 버전당 한 번만 생성하고 모든 세션/페이지가 공유 (읽기 전용으로 사용)
+@st.cache_resource(max_entries=2)
+def get_identity_index(version, _follower_df):
+    return IdentityIndex(_follower_df)
@@ -0,0 +1,105 @@
+# loader_logic.py
+import time
+import logging
+import threading
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# [공통 로더] 같은 키의 동시 요청은 한 번만 실행 (single-flight) + 갱신 중 이전 값 제공
+# ---------------------------------------------------------
+STALE_SECONDS = 600  # 기본: 만료 후 10분까지는 갱신을 기다리지 않고 이전 값 제공
+
+
+# 1. single-flight: 먼저 온 호출만 실행하고 나머지는 같은 결과를 기다림
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> Future
+
+    def _claim(self, key):
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = self._calls[key] = Future()
+            return future, True
+
+    def _run(self, key, future, fn):
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def do(self, key, fn):
+        future, leader = self._claim(key)
+        if leader:
+            self._run(key, future, fn)
+        return future.result()
+
+    def start(self, key, fn, name="singleflight"):
+        # 백그라운드 실행 (이미 진행 중이면 그 Future 반환)
+        future, leader = self._claim(key)
+        if leader:
+            threading.Thread(target=self._run, args=(key, future, fn), name=name, daemon=True).start()
+        return future
+
+    def in_flight(self, key):
+        with self._lock:
+            return key in self._calls
+
+
+# 2. 만료 + 유예 구간 로더
+#    max_age 이내: 캐시 값 / max_age ~ max_age+stale_seconds: 이전 값 + 백그라운드 갱신
+#    그 이후 또는 값 없음: 진행 중인 갱신 하나를 모두 함께 기다림 (실패 시 이전 값)
+class StaleLoader:
+    def __init__(self, fetch, max_age, stale_seconds=STALE_SECONDS, timeout=None, name="loader"):
+        self.fetch = fetch
+        self.max_age = max_age
+        self.stale_seconds = stale_seconds
+        self.timeout = timeout
+        self.name = name
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._value = None
+        self._updated = None  # monotonic
+
+    def _load(self):
+        value = self.fetch()
+        with self._lock:
+            self._value = value
+            self._updated = time.monotonic()
+        return value
+
+    def refresh(self):
+        return self._flight.do(self.name, self._load)
+
+    def get(self):
+        with self._lock:
+            value, updated = self._value, self._updated
+        if updated is None:
+            return self.refresh()
+
+        age = time.monotonic() - updated
+        if age <= self.max_age:
+            return value
+        future = self._flight.start(self.name, self._load, name=f"{self.name}-refresh")
+        if age <= self.max_age + self.stale_seconds:
+            return value
+        try:
+            return future.result(timeout=self.timeout)
+        except Exception as e:
+            logger.warning("%s refresh failed, serving stale value: %s", self.name, e)
+            return value
+
+    def status(self):
+        with self._lock:
+            updated = self._updated
+        return {
+            'updated': time.time() - (time.monotonic() - updated) if updated is not None else None,
+            'refreshing': self._flight.in_flight(self.name),
+        }
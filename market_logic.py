@@ -1,55 +1,203 @@
 # market_logic.py
+import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import yfinance as yf
+import history_logic
+import treemap_logic
+import loader_logic
 
-# 1. 데이터 가져오는 함수 (캐시 포함)
-@st.cache_data(ttl="5m") 
-def get_market_data():
-    tickers = {'KOSPI': '^KS11', 'Gold': 'GC=F', 'Ethereum': 'ETH-USD'}
-    market_df = []
-    for name, ticker in tickers.items():
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# [설정] 조회 종목 및 갱신 정책
+# ---------------------------------------------------------
+# 표시 이름 -> 야후 파이낸스 심볼 (secrets의 MARKET_SYMBOLS로 덮어쓰기 가능)
+MARKET_SYMBOLS = {'KOSPI': '^KS11', 'Gold': 'GC=F', 'Ethereum': 'ETH-USD'}
+REFRESH_SECONDS = 300   # 5분 지나면 백그라운드 갱신
+STALE_SECONDS = 600     # 갱신 중에는 만료 후 10분까지 이전 값 제공 (그 이후엔 새 값을 기다림)
+FETCH_TIMEOUT = 10      # 종목별 최대 대기 시간 (초)
+BACKFILL_TIMEOUT = 30   # 저장 기록이 없는 종목이 있을 때 (3개월치 첫 적재)
+MAX_WORKERS = 8
+SPARKLINE_DAYS = 30
+
+MARKET_COLUMNS = ['Name', 'Price', 'Change', 'Change7D', 'Change30D', 'Spark', 'Category']
+
+
+# 1. 데이터 제공자 (실서비스: 야후 파이낸스 / 오프라인: 고정 데이터)
+class YFinanceProvider:
+    def __init__(self):
+        # yfinance는 의존성이 커서 실제로 조회할 때만 불러옴
+        import yfinance
+        self.yf = yfinance
+
+    def history(self, ticker, period=None, start=None, interval="1d"):
+        return self.yf.Ticker(ticker).history(period=period, start=start, interval=interval)
+
+
+class FixtureProvider:
+    # 네트워크 없이 화면/로직을 확인하기 위한 고정 시세
+    DEFAULT_CLOSES = {
+        '^KS11': [2550.0, 2561.3, 2548.9, 2570.2, 2583.4],
+        'GC=F': [2330.1, 2338.7, 2341.0, 2329.5, 2335.2],
+        'ETH-USD': [3120.5, 3188.0, 3150.2, 3201.9, 3175.4],
+    }
+
+    def __init__(self, closes=None, delay=0.0):
+        self.closes = closes if closes is not None else self.DEFAULT_CLOSES
+        self.delay = delay
+
+    def history(self, ticker, period=None, start=None, interval="1d"):
+        if self.delay: time.sleep(self.delay)
+        closes = self.closes.get(ticker, [])
+        freq = 'h' if interval.endswith(('m', 'h')) else 'D'
+        end = pd.Timestamp.now(tz='UTC').floor(freq)
+        hist = pd.DataFrame({'Close': closes}, index=pd.date_range(end=end, periods=len(closes), freq=freq))
+        return hist[hist.index >= start] if start is not None else hist
+
+
+PROVIDERS = {'yfinance': YFinanceProvider, 'fixture': FixtureProvider}
+
+
+def get_symbols():
+    try:
+        symbols = st.secrets.get("MARKET_SYMBOLS")
+        if symbols: return dict(symbols)
+    except Exception:
+        pass
+    return dict(MARKET_SYMBOLS)
+
+
+# 2. 시세 엔진 (병렬 조회 + 갱신 중에는 마지막 정상 값 제공)
+class MarketEngine:
+    def __init__(self, provider, symbols, store=None, refresh_seconds=REFRESH_SECONDS, timeout=FETCH_TIMEOUT,
+                 stale_seconds=STALE_SECONDS, backfill_timeout=BACKFILL_TIMEOUT):
+        self.provider = provider
+        self.store = store if store is not None else history_logic.HistoryStore()
+        self.symbols = symbols
+        self.refresh_seconds = refresh_seconds
+        self.timeout = timeout
+        self.backfill_timeout = backfill_timeout
+        self._pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="market")
+        self._lock = threading.Lock()
+        self._rows = {}          # 이름 -> 마지막 정상 값
+        self._inflight = {}      # 이름 -> 아직 끝나지 않은 조회 (시간 초과 후에도 계속 실행됨)
+        # 동시 조회는 한 번으로 합치고, 만료 후에는 이전 값을 먼저 보여줌
+        self._loader = loader_logic.StaleLoader(
+            self._refresh, max_age=refresh_seconds, stale_seconds=stale_seconds, timeout=timeout, name="market"
+        )
+
+    def _fetch_one(self, name, ticker):
+        # 저장소에 없는 최신 구간만 받아온 뒤, 계산은 로컬 데이터로
+        self.store.sync(self.provider, ticker)
+        closes = self.store.load(ticker, '1d')
+        if len(closes) < 2: return None
+        return {
+            'Name': name, 'Price': closes.iloc[-1], 'Category': 'Major Asset',
+            'Change': history_logic.change_since(closes, 1) or 0,
+            'Change7D': history_logic.change_since(closes, 7),
+            'Change30D': history_logic.change_since(closes, 30),
+            'Spark': closes.iloc[-SPARKLINE_DAYS:].tolist(),
+        }
+
+    def _store(self, name, future):
+        # 조회가 끝나면 (시간 초과 후 늦게 끝난 경우 포함) 결과 반영
         try:
-            stock = yf.Ticker(ticker)
-            hist = stock.history(period="7d")
-            hist = hist.dropna(subset=['Close'])
-            if len(hist) >= 2: 
-                current_price = hist['Close'].iloc[-1]
-                prev_price = hist['Close'].iloc[-2]
-                change_pct = ((current_price - prev_price) / prev_price) * 100 if prev_price != 0 else 0
-                market_df.append({'Name': name, 'Price': current_price, 'Change': change_pct, 'Category': 'Major Asset'})
-        except: continue
-    return pd.DataFrame(market_df)
-
-# 2. 화면에 그리는 함수 (Main 함수)
+            row = future.result()
+        except Exception as e:
+            logger.warning("market fetch failed (%s): %s", name, e)
+            row = None
+        with self._lock:
+            if row: self._rows[name] = row
+            if self._inflight.get(name) is future:
+                del self._inflight[name]
+
+    def _refresh(self):
+        # 처음 적재하는 종목이 있으면 더 오래 기다림 (증분 갱신보다 받아올 구간이 김)
+        backfill = any(self.store.last_ts(ticker, '1d') is None for ticker in self.symbols.values())
+        futures, submitted = {}, []
+        with self._lock:
+            for name, ticker in self.symbols.items():
+                # 이전 조회가 아직 진행 중인 종목은 다시 요청하지 않고 그 결과를 기다림 (같은 행 동시 기록 방지)
+                future = self._inflight.get(name)
+                if future is None:
+                    future = self._inflight[name] = self._pool.submit(self._fetch_one, name, ticker)
+                    submitted.append((name, future))
+                futures[future] = name
+        # 이미 끝난 Future는 콜백을 바로 호출하므로 잠금 밖에서 등록
+        for name, future in submitted:
+            future.add_done_callback(lambda f, name=name: self._store(name, f))
+        # 모든 종목을 동시에 요청하므로 전체 대기 시간 = 가장 느린 종목 (최대 timeout)
+        done, not_done = wait(futures, timeout=self.backfill_timeout if backfill else self.timeout)
+        for future in done:
+            # 완료 콜백보다 먼저 깨어날 수 있으므로 아직 반영 전이면 여기서 반영
+            name = futures[future]
+            with self._lock:
+                pending = self._inflight.get(name) is future
+            if pending: self._store(name, future)
+        for future in not_done:
+            logger.warning("market fetch timed out (%s)", futures[future])
+        with self._lock:
+            # 실패/지연된 종목은 직전 값을 유지
+            return [self._rows[name] for name in self.symbols if name in self._rows]
+
+    def refresh(self):
+        return self._loader.refresh()
+
+    def status(self):
+        with self._lock:
+            rows = len(self._rows)
+        return {**self._loader.status(), 'rows': rows}
+
+    def snapshot(self):
+        return pd.DataFrame(self._loader.get(), columns=MARKET_COLUMNS)
+
+
+@st.cache_resource
+def get_market_engine():
+    provider_name = os.environ.get("MARKET_DATA_PROVIDER", "yfinance")
+    return MarketEngine(PROVIDERS[provider_name](), get_symbols())
+
+
+def get_market_data():
+    return get_market_engine().snapshot()
+
+# 3. 화면에 그리는 함수 (Main 함수)
 def render_market_page():
     st.title("📊 시장 지수 (Market Indices)")
-    st.caption("Real-time Data: KOSPI, Gold, Ethereum")
+    st.caption(f"Real-time Data: {', '.join(get_market_engine().symbols)}")
     
     market_df = get_market_data()
     
     if not market_df.empty:
-        col1, col2, col3 = st.columns(3)
-        cols = [col1, col2, col3]
-        for i, row in market_df.iterrows():
-            if i < 3:
+        for start in range(0, len(market_df), 3):
+            cols = st.columns(3)
+            for i, row in market_df.iloc[start:start + 3].reset_index(drop=True).iterrows():
                 name, price, change = row['Name'], row['Price'], row['Change']
                 color_class = "delta-up" if change >= 0 else "delta-down"
                 arrow = "▲" if change >= 0 else "▼"
+                periods = " · ".join(
+                    f"{label} {value:+.2f}%" for label, value in (('7D', row['Change7D']), ('30D', row['Change30D'])) if pd.notna(value)
+                )
+                spark = history_logic.sparkline_svg(row['Spark'], color='#10B981' if change >= 0 else '#EF4444')
                 with cols[i]:
                     st.markdown(f"""
                     <div class="metric-card">
                         <div class="metric-label">{name}</div>
                         <div class="metric-value">{price:,.2f}</div>
                         <div class="metric-delta {color_class}">{arrow} {change:.2f}%</div>
+                        <div class="metric-label" style="margin-top:6px;">{periods}</div>
+                        {spark}
                     </div>""", unsafe_allow_html=True)
         
         st.write("")
-        fig = px.treemap(
-            market_df, path=['Category', 'Name'], values='Price', color='Change', 
-            custom_data=['Change'], color_continuous_scale=['#EF4444', '#1F2937', '#10B981'], 
-            color_continuous_midpoint=0, template="plotly_dark"
+        fig = treemap_logic.two_level_treemap(
+            market_df['Category'], market_df['Name'], market_df['Price'], market_df['Change'],
+            custom_data=market_df[['Change']], color_scale=['#EF4444', '#1F2937', '#10B981'], color_midpoint=0,
+            hovertemplate='<b>%{label}</b><br>Price: %{value:,.2f}<br>Change: %{customdata[0]:.2f}%<extra></extra>'
         )
         fig.update_traces(
             texttemplate='<b>%{label}</b><br>%{value:,.2f}<br>%{customdata[0]:.2f}%',
@@ -0,0 +1,69 @@
+# page_logic.py
+import sys
+import time
+import logging
+import importlib
+import threading
+
+import perf_logic
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# [페이지 등록] 메뉴 -> (모듈, 렌더 함수, 인자) / 모듈은 처음 열 때 불러옴
+# ---------------------------------------------------------
+# 인자 종류: 'conn_df' = (conn, 메인 시트, 메인 시트 버전), 'conn' = (conn), None = 인자 없음
+PAGES = {
+    "트위터 팔로워 맵": ('follower_logic', 'render_follower_page', 'conn_df'),
+    "크립토 플젝맵": ('project_logic', 'render_project_page', 'conn_df'),
+    "트위터 주급 맵": ('payout_logic', 'render_payout_page', 'conn_df'),
+    "실시간 트위터": ('twitter_logic', 'render_twitter_page', None),
+    "지수 비교 (Indices)": ('market_logic', 'render_market_page', None),
+    "텔레그램 이벤트": ('event_logic', 'render_event_page', 'conn'),
+}
+
+_lock = threading.Lock()
+_import_ms = {}  # 모듈 -> 첫 import 시간 (ms)
+
+
+# 1. 모듈 불러오기 (프로세스당 한 번, 걸린 시간 기록)
+def load(module_name):
+    if module_name in _import_ms:
+        return sys.modules[module_name]
+    # 다른 스레드가 불러오는 중이면 import_module이 완료될 때까지 기다림
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    elapsed = (time.perf_counter() - start) * 1000
+    with _lock:
+        if module_name not in _import_ms:
+            _import_ms[module_name] = elapsed
+            perf_logic.record('import', module_name, elapsed)
+            logger.info("imported %s in %.0f ms", module_name, elapsed)
+    return module
+
+
+# 스냅샷 prewarm 등록용 래퍼: 페이지 모듈이 이미 불러와진 경우에만 실행
+# (시작 시 일괄 로드가 페이지 모듈을 import하지 않도록, 아직 안 연 페이지는 처음 열 때 캐시 생성)
+def when_loaded(module_name, attr):
+    def call(*args, **kwargs):
+        build = getattr(sys.modules.get(module_name), attr, None)
+        return build(*args, **kwargs) if build is not None else None
+    call.__name__ = f"{module_name}.{attr}"
+    return call
+
+
+def is_loaded(module_name):
+    return module_name in sys.modules
+
+
+# 2. 메뉴 렌더링
+def render(menu, conn, get_sheet):
+    # get_sheet: 메인 시트 (버전, 프레임)을 함께 돌려주는 함수
+    module_name, attr, args = PAGES[menu]
+    page = getattr(load(module_name), attr)
+    if args == 'conn_df':
+        version, df = get_sheet()
+        return page(conn, df, version)
+    if args == 'conn':
+        return page(conn)
+    return page()
@@ -1,13 +1,18 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import numpy as np
-
-# 1. 주급 데이터 가져오기
-def get_payout_data(conn): 
+import ranking_logic
+import treemap_logic
+import summary_logic
+import identity_logic
+import snapshot_logic
+import schema_logic
+import perf_logic
+
+# 1. 주급 데이터 정제 (시트 버전별로 한 번만)
+def clean_payout_data(raw_df): 
     try:
-        # 30분 캐시
-        df = conn.read(worksheet="payouts", ttl="30m") 
+        df = raw_df.copy()
         
         if df is not None and not df.empty:
             # 숫자 변환 (콤마 제거)
@@ -30,8 +35,60 @@ def get_payout_data(conn):
     except Exception as e:
         return pd.DataFrame(columns=['handle', 'name', 'payout_amount', 'category', 'bio'])
 
+
+# 로컬 스냅샷에서 불러오기 (시트 갱신은 백그라운드에서, 정제 결과는 세션 간 공유)
+def build_payout_data(version, raw_df):
+    return schema_logic.share(schema_logic.load_shared('payouts', version, lambda: clean_payout_data(raw_df)))
+
+
+def get_payout_data(conn):
+    version, raw_df = snapshot_logic.get_snapshot(conn, "payouts")
+    return version, build_payout_data(version, raw_df)
+
+
+# 팔로워 수 붙이기 (정규화 핸들 기준 조회)
+def attach_followers(payout_df, follower_df, follower_version):
+    payout_df = payout_df.copy()
+    payout_df['followers'] = 0
+    if not follower_df.empty:
+        identity = identity_logic.get_identity_index(follower_version, follower_df)
+        payout_df['followers'] = identity.lookup(payout_df['handle'])['followers'].fillna(0)
+    return payout_df
+
+
+def build_payout_figure(display_df, merge_categories):
+    display_df = display_df.copy()
+    display_df['chart_label'] = treemap_logic.label_series(display_df['name'], "@" + display_df['handle'].astype(str))
+
+    fig = treemap_logic.two_level_treemap(
+        "전체 (All)" if merge_categories else display_df['category'],
+        display_df['chart_label'],
+        display_df['payout_amount'],
+        display_df['payout_amount'],
+        custom_data=display_df[['name', 'handle']],
+        top_n=treemap_logic.get_top_n(),
+    )
+    
+    fig.update_traces(
+        texttemplate='<b>%{customdata[0]}</b><br><b style="font-size:1.2em">$%{value:,.0f}</b><br><span style="font-size:0.8em; color:#D1D5DB">%{percentRoot:.1%}</span>',
+        textfont=dict(size=20, family="sans-serif", color="white"),
+        textposition="middle center",
+        marker=dict(line=dict(width=3, color='#000000')),
+        root_color="#000000",
+        hovertemplate='<b>%{customdata[0]}</b> (@%{customdata[1]})<br>Payout: $%{value:,.0f}<br>Share: %{percentRoot:.1%}<extra></extra>'
+    )
+
+    fig.update_layout(
+        margin=dict(t=0, l=0, r=0, b=0), 
+        paper_bgcolor='#000000', plot_bgcolor='#000000', 
+        height=600, coloraxis_showscale=False,
+        hoverlabel=dict(bgcolor="#1C1F26", bordercolor="#10B981", font=dict(size=18, color="white"), namelength=-1)
+    )
+    return fig
+
+
 # 2. 주급 맵 렌더링
-def render_payout_page(conn, follower_df):
+def render_payout_page(conn, follower_df, follower_version):
     # ---------------------------------------------------------
     # [CSS] 카테고리 버튼 스타일링 (알약 모양)
     # ---------------------------------------------------------
@@ -94,7 +151,8 @@ def render_payout_page(conn, follower_df):
     st.title("💰 트위터 주급 맵 (Weekly Payout)")
     st.caption("이번 주 트위터 수익 정산 현황")
 
-    payout_df = get_payout_data(conn)
+    with perf_logic.stage('payout', 'load'):
+        payout_version, payout_df = get_payout_data(conn)
     
     if not payout_df.empty:
         # 0원인 사람은 제외
@@ -128,31 +186,23 @@ def render_payout_page(conn, follower_df):
         st.write("") # 간격 추가
 
         # ---------------------------------------------------------
-        # 데이터 필터링
+        # [핵심] 팔로워 데이터와 병합 + 카테고리 요약 (데이터 버전별 1회)
         # ---------------------------------------------------------
-        if selected_category != "전체보기":
-            display_df = display_df[display_df['category'] == selected_category]
-        
+        version = (payout_version, follower_version)
+        with perf_logic.stage('payout', 'filter'):
+            summary = summary_logic.get_category_summary(
+                'payout', version, lambda: attach_followers(display_df, follower_df, follower_version), 'payout_amount'
+            )
+            # 주급 내림차순으로 이미 정렬된 행
+            display_df = summary.ranking(selected_category)
+
         if display_df.empty:
             st.info(f"'{selected_category}' 데이터가 없습니다.")
             return
 
-        # ---------------------------------------------------------
-        # [핵심] 팔로워 데이터와 병합
-        # ---------------------------------------------------------
-        if not follower_df.empty:
-            merged_df = pd.merge(
-                display_df, 
-                follower_df[['handle', 'followers']], 
-                on='handle', 
-                how='left'
-            )
-            merged_df['followers'] = merged_df['followers'].fillna(0)
-            display_df = merged_df
-
         # 상단 요약 카드
-        total_payout = display_df['payout_amount'].sum()
-        top_earner = display_df.loc[display_df['payout_amount'].idxmax()]
+        total_payout = summary.total(selected_category)
+        top_earner = summary.top(selected_category)
         
         col1, col2 = st.columns(2)
         with col1: 
@@ -173,40 +223,12 @@ def render_payout_page(conn, follower_df):
         # ---------------------------------------------------------
         # 1. 트리맵 차트
         # ---------------------------------------------------------
-        display_df['chart_label'] = display_df.apply(
-            lambda x: f"{str(x['name'])}<br><span style='font-size:0.7em; font-weight:normal;'>@{str(x['handle'])}</span>", 
-            axis=1
-        )
-        
-        path_list = ['root_group', 'chart_label'] if merge_categories else ['category', 'chart_label']
-        if merge_categories: display_df['root_group'] = "전체 (All)"
-        
-        fig = px.treemap(
-            display_df, 
-            path=path_list, 
-            values='payout_amount', 
-            color='payout_amount', 
-            custom_data=['name', 'handle'],
-            color_continuous_scale=[(0.00, '#2E2B4E'), (0.05, '#353263'), (0.10, '#3F3C5C'), (0.15, '#464282'), (0.20, '#4A477A'), (0.25, '#4A5D91'), (0.30, '#4A6FA5'), (0.35, '#537CA8'), (0.40, '#5C8BAE'), (0.45, '#5C98AE'), (0.50, '#5E9CA8'), (0.55, '#5E9E94'), (0.60, '#5F9E7F'), (0.65, '#729E6F'), (0.70, '#859E5F'), (0.75, '#969E5F'), (0.80, '#A89E5F'), (0.85, '#AD905D'), (0.90, '#AE815C'), (0.95, '#AE6E5C'), (1.00, '#AE5C5C')],
-            template="plotly_dark"
-        )
-        
-        fig.update_traces(
-            texttemplate='<b>%{customdata[0]}</b><br><b style="font-size:1.2em">$%{value:,.0f}</b><br><span style="font-size:0.8em; color:#D1D5DB">%{percentRoot:.1%}</span>',
-            textfont=dict(size=20, family="sans-serif", color="white"),
-            textposition="middle center",
-            marker=dict(line=dict(width=3, color='#000000')),
-            root_color="#000000",
-            hovertemplate='<b>%{customdata[0]}</b> (@%{customdata[1]})<br>Payout: $%{value:,.0f}<br>Share: %{percentRoot:.1%}<extra></extra>'
-        )
-        
-        fig.update_layout(
-            margin=dict(t=0, l=0, r=0, b=0), 
-            paper_bgcolor='#000000', plot_bgcolor='#000000', 
-            height=600, coloraxis_showscale=False,
-            hoverlabel=dict(bgcolor="#1C1F26", bordercolor="#10B981", font=dict(size=18, color="white"), namelength=-1)
-        )
-        st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+        with perf_logic.stage('payout', 'treemap'):
+            fig = treemap_logic.get_figure(
+                ('payout', version, selected_category, merge_categories),
+                lambda: build_payout_figure(display_df, merge_categories)
+            )
+            st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
         
         st.write("")
 
@@ -219,51 +241,8 @@ def render_payout_page(conn, follower_df):
         with col_toggle:
             expand_view = st.toggle("전체 펼치기", value=False, key="payout_toggle")
 
-        ranking_df = display_df.sort_values(by='payout_amount', ascending=False).reset_index(drop=True)
-        
-        list_html = ""
-        for index, row in ranking_df.iterrows():
-            rank = index + 1
-            medal = "🥇" if rank == 1 else "🥈" if rank == 2 else "🥉" if rank == 3 else f"{rank}"
-            img_url = f"https://unavatar.io/twitter/{row['handle']}"
-            
-            bio_content = row['bio'] if row['bio'] else "수익 인증 상세 정보가 없습니다."
-            
-            follower_count = int(row['followers']) if 'followers' in row else 0
-            follower_text = f"{follower_count:,}"
-
-            list_html += f"""
-            <details {'open' if expand_view else ''}>
-                <summary>
-                    <div class="ranking-row">
-                        <div class="rank-col-1">
-                            <div class="rank-num">{medal}</div>
-                            <img src="{img_url}" class="rank-img" onerror="this.style.display='none'">
-                        </div>
-                        <div class="rank-info">
-                            <div class="rank-name">{row['name']}</div>
-                            <div class="rank-handle">@{row['handle']}</div>
-                        </div>
-                        <div class="rank-extra">
-                        </div>
-                        <div class="rank-stats-group" style="width: 200px;"> 
-                            <div class="rank-category" style="background-color: #1F2937; color: #9CA3AF;">👥 {follower_text}</div>
-                            <div class="rank-followers" style="width: 80px; color: #10B981;">${int(row['payout_amount']):,}</div>
-                        </div>
-                    </div>
-                </summary>
-                <div class="bio-box">
-                    <div class="bio-header">💰 PAYOUT INFO</div>
-                    <div class="bio-content">{bio_content}</div>
-                    <a href="https://twitter.com/{row['handle']}" target="_blank" class="bio-link-btn">
-                        Visit Profile ↗
-                    </a>
-                </div>
-            </details>
-            """
-
-        with st.container(height=600 if not expand_view else None):
-            st.markdown(list_html, unsafe_allow_html=True)
+        with perf_logic.stage('payout', 'leaderboard'):
+            ranking_logic.render_leaderboard('payout', display_df, summary.version, selected_category, expand_view)
 
     else:
         st.info("주급 데이터를 불러올 수 없습니다. 'payouts' 시트를 확인해주세요.")
@@ -0,0 +1,73 @@
+# perf_logic.py
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+
+# ---------------------------------------------------------
+# [성능 계측] 페이지/단계별 소요 시간 + 캐시 적중률 (프로세스 메모리, 최근 N건만)
+# ---------------------------------------------------------
+RING_SIZE = 500  # (페이지, 단계)마다 보관할 최근 측정 수
+
+_lock = threading.Lock()
+_samples = {}  # (page, stage) -> deque[ms]
+_caches = {}   # cache 이름 -> [hit, miss]
+
+
+# 1. 단계 측정 (with 블록)
+def record(page, stage_name, ms):
+    with _lock:
+        ring = _samples.get((page, stage_name))
+        if ring is None:
+            ring = _samples[(page, stage_name)] = deque(maxlen=RING_SIZE)
+        ring.append(ms)
+
+
+@contextmanager
+def stage(page, stage_name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(page, stage_name, (time.perf_counter() - start) * 1000)
+
+
+# 2. 캐시 적중/미스 집계
+def count_cache(name, hit):
+    with _lock:
+        counts = _caches.setdefault(name, [0, 0])
+        counts[0 if hit else 1] += 1
+
+
+# 3. 관리자 화면용 요약
+def stage_table():
+    with _lock:
+        snapshot = {key: np.array(ring) for key, ring in _samples.items()}
+    rows = []
+    for (page, stage_name), values in sorted(snapshot.items()):
+        if not len(values): continue
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        rows.append({
+            'page': page, 'stage': stage_name, 'count': len(values),
+            'p50_ms': round(p50, 1), 'p95_ms': round(p95, 1), 'p99_ms': round(p99, 1),
+            'max_ms': round(values.max(), 1), 'last_ms': round(values[-1], 1),
+        })
+    return pd.DataFrame(rows, columns=['page', 'stage', 'count', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms', 'last_ms'])
+
+
+def cache_table():
+    with _lock:
+        counts = {name: tuple(c) for name, c in _caches.items()}
+    rows = []
+    for name, (hit, miss) in sorted(counts.items()):
+        total = hit + miss
+        rows.append({'cache': name, 'hit': hit, 'miss': miss, 'hit_rate': f"{hit / total:.1%}" if total else "-"})
+    return pd.DataFrame(rows, columns=['cache', 'hit', 'miss', 'hit_rate'])
+
+
+def reset():
+    with _lock:
+        _samples.clear()
+        _caches.clear()
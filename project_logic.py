@@ -1,14 +1,19 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import numpy as np
-import html
-
-# 1. 프로젝트 데이터 가져오기 및 포인트 계산
-def get_project_data(conn): 
+import ranking_logic
+import treemap_logic
+import summary_logic
+import identity_logic
+import scoring_logic
+import snapshot_logic
+import schema_logic
+import perf_logic
+
+# 1. 프로젝트 데이터 정제 (시트 버전별로 한 번만)
+def prepare_project_data(raw_df): 
     try:
-        # 캐시 없이 즉시 불러오기
-        df = conn.read(worksheet="projects", ttl="0") 
+        df = raw_df.copy()
         
         if df is not None and not df.empty:
             # 컬럼 매핑
@@ -37,45 +42,80 @@ def get_project_data(conn):
             # 표준 핸들 포맷 (@붙이기)
             df['handle'] = df['name'].apply(lambda x: x if str(x).startswith('@') else f"@{x}")
             
-            # [매칭 키] 소문자, 공백제거, @제거
-            df['join_key'] = df['handle'].astype(str).str.replace('@', '').str.strip().str.lower()
+            # [매칭 키] 소문자, 공백제거, @제거 (전 페이지 공통 규칙)
+            df['join_key'] = identity_logic.normalize_handle(df['handle'])
 
             if 'desc' not in df.columns: df['desc'] = ""
             df['desc'] = df['desc'].fillna("")
 
             if 'category' not in df.columns: df['category'] = "전체"
             df['category'] = df['category'].fillna("전체")
-
-            # ---------------------------------------------------------
-            # 포인트(점수) 및 마인드쉐어 계산
-            # ---------------------------------------------------------
-            max_mentions = df['mentions'].max()
-            max_views = df['views'].max()
-            
-            if max_mentions == 0: max_mentions = 1
-            if max_views == 0: max_views = 1
-            
-            # 기본 점수 산출
-            df['raw_score'] = (
-                (df['mentions'] / max_mentions) * 40 + 
-                (df['views'] / max_views) * 60
-            )
-            
-            # 마인드쉐어(%) 계산
-            total_score = df['raw_score'].sum()
-            if total_score == 0: total_score = 1
-            
-            df['mindshare'] = (df['raw_score'] / total_score) * 100
-            
-            # 트리맵 크기용
-            df['value'] = df['raw_score']
             
         return df
     except Exception as e:
         return pd.DataFrame(columns=['name', 'handle', 'mentions', 'views', 'desc', 'category', 'value', 'join_key', 'mindshare'])
 
-# 2. 렌더링 함수
-def render_project_page(conn, follower_df_raw):
+# 2. 프로젝트 데이터 가져오기 및 포인트 계산 (로컬 스냅샷 + 점수 엔진)
+def build_project_data(version, raw_df):
+    df = schema_logic.share(schema_logic.load_shared('projects', version, lambda: prepare_project_data(raw_df)))
+    if not df.empty and 'mentions' in df.columns:
+        df = scoring_logic.apply_scores(df, version)
+    return df
+
+
+def get_project_data(conn):
+    version, raw_df = snapshot_logic.get_snapshot(conn, "projects")
+    return version, build_project_data(version, raw_df)
+
+
+# 팔로워 시트 기준 실명/팔로워 수 붙이기 (정규화 핸들 기준 조회)
+def attach_identity(df, follower_df_raw, follower_version):
+    df = df.copy()
+    df['real_name'] = df['handle'] 
+    df['followers'] = 0 
+
+    if not follower_df_raw.empty:
+        identity = identity_logic.get_identity_index(follower_version, follower_df_raw)
+        matched = identity.lookup(df['join_key'])
+        df['real_name'] = matched['name'].fillna(df['handle'])
+        df['followers'] = matched['followers'].fillna(0)
+    return df
+
+
+def build_project_figure(display_df, merge_categories):
+    display_df = display_df.copy()
+    display_df['chart_label'] = treemap_logic.label_series(
+        display_df['real_name'], display_df['mindshare'].map('{:.1f}%'.format), font_size='0.8em'
+    )
+
+    fig = treemap_logic.two_level_treemap(
+        "전체 (All)" if merge_categories else display_df['category'],
+        display_df['chart_label'],
+        display_df['value'],
+        display_df['value'],
+        custom_data=display_df[['real_name', 'handle', 'mentions', 'views', 'followers', 'mindshare']],
+        top_n=treemap_logic.get_top_n(),
+    )
+    
+    fig.update_traces(
+        texttemplate='<b>%{customdata[0]}</b><br><b style="font-size:1.4em">%{customdata[5]:.1f}%</b>',
+        textfont=dict(size=20, family="sans-serif", color="white"),
+        textposition="middle center",
+        marker=dict(line=dict(width=3, color='#000000')), 
+        hovertemplate='<b>%{customdata[0]}</b> (%{customdata[1]})<br>Mindshare: %{customdata[5]:.1f}%<br>Followers: %{customdata[4]:,.0f}<extra></extra>'
+    )
+
+    fig.update_layout(
+        margin=dict(t=0, l=0, r=0, b=0), 
+        paper_bgcolor='#000000', plot_bgcolor='#000000', 
+        height=600, coloraxis_showscale=False,
+        hoverlabel=dict(bgcolor="#1C1F26", bordercolor="#10B981", font=dict(size=18, color="white"), namelength=-1)
+    )
+    return fig
+
+
+# 3. 렌더링 함수
+def render_project_page(conn, follower_df_raw, follower_version):
     # ---------------------------------------------------------
     # [CSS] 스타일링 (비고 줄바꿈 포함)
     # ---------------------------------------------------------
@@ -108,38 +148,13 @@ def render_project_page(conn, follower_df_raw):
     st.title("🧩 크립토 플젝맵 (Crypto Projects)")
     
     # 1. 프로젝트 데이터 로드
-    df = get_project_data(conn)
+    with perf_logic.stage('project', 'load'):
+        project_version, df = get_project_data(conn)
     
     if df.empty or 'value' not in df.columns:
         st.info("데이터를 불러올 수 없습니다. 'projects' 시트를 확인해주세요.")
         return
 
-    # ---------------------------------------------------------
-    # 팔로워 데이터 병합
-    # ---------------------------------------------------------
-    df['real_name'] = df['handle'] 
-    df['followers'] = 0 
-
-    if not follower_df_raw.empty:
-        f_df = follower_df_raw.copy()
-        f_df['followers'] = pd.to_numeric(f_df['followers'], errors='coerce').fillna(0)
-        f_df['join_key'] = f_df['handle'].astype(str).str.replace('@', '').str.strip().str.lower()
-        f_df = f_df.sort_values('followers', ascending=False).drop_duplicates('join_key')
-        
-        merged = pd.merge(
-            df, 
-            f_df[['join_key', 'name', 'followers']], 
-            on='join_key', 
-            how='left',
-            suffixes=('', '_map')
-        )
-        
-        df['real_name'] = merged['name_map'].fillna(df['handle'])
-        if 'followers_map' in merged.columns:
-             df['followers'] = merged['followers_map'].fillna(0)
-        else:
-             df['followers'] = merged['followers'].fillna(0)
-
     # ---------------------------------------------------------
     # [UI] 카테고리 선택
     # ---------------------------------------------------------
@@ -161,12 +176,15 @@ def render_project_page(conn, follower_df_raw):
     st.write("") 
 
     # ---------------------------------------------------------
-    # 데이터 필터링
+    # 팔로워 데이터 병합 + 카테고리 요약 (데이터 버전별 1회)
     # ---------------------------------------------------------
-    if selected_category == "전체보기":
-        display_df = df[df['value'] > 0]
-    else:
-        display_df = df[(df['category'] == selected_category) & (df['value'] > 0)]
+    version = (project_version, follower_version)
+    with perf_logic.stage('project', 'filter'):
+        summary = summary_logic.get_category_summary(
+            'project', version, lambda: attach_identity(df, follower_df_raw, follower_version), 'value', ('mentions',)
+        )
+        # 점수 내림차순으로 이미 정렬된 행
+        display_df = summary.ranking(selected_category)
 
     if display_df.empty:
         st.info(f"'{selected_category}' 데이터가 없습니다.")
@@ -176,10 +194,10 @@ def render_project_page(conn, follower_df_raw):
     # 상단 요약
     # ---------------------------------------------------------
     col1, col2, col3 = st.columns(3)
-    total_acc = len(display_df)
-    total_mentions = display_df['mentions'].sum()
+    total_acc = summary.count(selected_category)
+    total_mentions = summary.total(selected_category, 'mentions')
     
-    top_one = display_df.loc[display_df['value'].idxmax()]
+    top_one = summary.top(selected_category)
     top_text = f"{top_one['real_name']} ({top_one['handle']})"
 
     with col1: st.markdown(f'<div class="metric-card"><div class="metric-label">랭킹 계정 수</div><div class="metric-value">{total_acc}</div></div>', unsafe_allow_html=True)
@@ -191,39 +209,12 @@ def render_project_page(conn, follower_df_raw):
     # ---------------------------------------------------------
     # 트리맵 차트 (마인드쉐어 표시)
     # ---------------------------------------------------------
-    display_df['chart_label'] = display_df.apply(
-        lambda x: f"{str(x['real_name'])}<br><span style='font-size:0.8em; font-weight:normal;'>{x['mindshare']:.1f}%</span>", 
-        axis=1
-    )
-    
-    path_list = ['root_group', 'chart_label'] if merge_categories else ['category', 'chart_label']
-    if merge_categories: display_df['root_group'] = "전체 (All)"
-
-    fig = px.treemap(
-        display_df, 
-        path=path_list, 
-        values='value', 
-        color='value',
-        custom_data=['real_name', 'handle', 'mentions', 'views', 'followers', 'mindshare'],
-        color_continuous_scale=[(0.00, '#2E2B4E'), (0.05, '#353263'), (0.10, '#3F3C5C'), (0.15, '#464282'), (0.20, '#4A477A'), (0.25, '#4A5D91'), (0.30, '#4A6FA5'), (0.35, '#537CA8'), (0.40, '#5C8BAE'), (0.45, '#5C98AE'), (0.50, '#5E9CA8'), (0.55, '#5E9E94'), (0.60, '#5F9E7F'), (0.65, '#729E6F'), (0.70, '#859E5F'), (0.75, '#969E5F'), (0.80, '#A89E5F'), (0.85, '#AD905D'), (0.90, '#AE815C'), (0.95, '#AE6E5C'), (1.00, '#AE5C5C')],
-        template="plotly_dark"
-    )
-    
-    fig.update_traces(
-        texttemplate='<b>%{customdata[0]}</b><br><b style="font-size:1.4em">%{customdata[5]:.1f}%</b>',
-        textfont=dict(size=20, family="sans-serif", color="white"),
-        textposition="middle center",
-        marker=dict(line=dict(width=3, color='#000000')), 
-        hovertemplate='<b>%{customdata[0]}</b> (%{customdata[1]})<br>Mindshare: %{customdata[5]:.1f}%<br>Followers: %{customdata[4]:,.0f}<extra></extra>'
-    )
-    
-    fig.update_layout(
-        margin=dict(t=0, l=0, r=0, b=0), 
-        paper_bgcolor='#000000', plot_bgcolor='#000000', 
-        height=600, coloraxis_showscale=False,
-        hoverlabel=dict(bgcolor="#1C1F26", bordercolor="#10B981", font=dict(size=18, color="white"), namelength=-1)
-    )
-    st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+    with perf_logic.stage('project', 'treemap'):
+        fig = treemap_logic.get_figure(
+            ('project', version, selected_category, merge_categories),
+            lambda: build_project_figure(display_df, merge_categories)
+        )
+        st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
 
     st.write("")
     
@@ -234,53 +225,5 @@ def render_project_page(conn, follower_df_raw):
     with col_head: st.subheader("📋 계정 랭킹 (Account Ranking)")
     with col_toggle: expand_view = st.toggle("전체 펼치기", value=False, key="project_list_toggle")
     
-    ranking_df = display_df.sort_values(by='value', ascending=False).reset_index(drop=True)
-    
-    def clean_str(val):
-        if pd.isna(val): return ""
-        s = str(val).strip()
-        if s.lower() == 'nan': return ""
-        return s
-
-    list_html = ""
-    for index, row in ranking_df.iterrows():
-        rank = index + 1
-        medal = "🥇" if rank == 1 else "🥈" if rank == 2 else "🥉" if rank == 3 else f"{rank}"
-        
-        clean_id = str(row['handle']).replace('@', '')
-        img_url = f"https://unavatar.io/twitter/{clean_id}"
-        
-        desc_raw = clean_str(row.get('desc', ''))
-        desc_safe = html.escape(desc_raw)
-        
-        # [수정] 마인드쉐어: 글자 없이 숫자만 (18.3%)
-        mindshare_text = f"{row['mindshare']:.1f}%"
-        
-        # [수정] 팔로워 수
-        follower_text = f"👥 {int(row['followers']):,}"
-
-        # [디자인 변경] 팔로워(회색,작게) + 마인드쉐어(초록색,크게) 가로 배치
-        list_html += f'''
-<details {'open' if expand_view else ''}>
-<summary>
-<div class="ranking-row">
-<div class="rank-col-1"><div class="rank-num">{medal}</div><img src="{img_url}" class="rank-img" onerror="this.style.display='none'"></div>
-<div class="rank-info"><div class="rank-name">{row['real_name']}</div><div class="rank-handle" style="font-size:11px; color:#9CA3AF;">{row['handle']}</div></div>
-<div class="rank-extra" style="display: block; white-space: normal; height: auto; padding: 4px 0;"><span class="rank-interest" style="font-weight:400; color:#D1D5DB !important; font-size:13px; line-height:1.4;">{desc_safe}</span></div>
-<div class="rank-stats-group" style="width: 200px; display:flex; flex-direction:row; justify-content:flex-end; align-items:center; gap: 12px;">
-<div style="color:#6B7280; font-size:13px; font-weight:500; white-space:nowrap;">{follower_text}</div>
-<div style="color:#10B981; font-size:20px; font-weight:800; text-shadow: 0 0 5px rgba(16, 185, 129, 0.2);">{mindshare_text}</div>
-</div>
-</div>
-</summary>
-<div class="bio-box">
-<div class="bio-header">📝 NOTE</div>
-<div class="bio-content">{desc_safe if desc_safe else "비고 없음"}</div>
-<div style="margin-top:10px; font-size:12px; color:#6B7280;">• Followers: {int(row['followers']):,}<br>• Mindshare Score: {row['mindshare']:.2f}%</div>
-<a href="https://twitter.com/{clean_id}" target="_blank" class="bio-link-btn">Visit Profile ↗</a>
-</div>
-</details>
-'''
-    
-    with st.container(height=600 if not expand_view else None):
-        st.markdown(list_html, unsafe_allow_html=True)
+    with perf_logic.stage('project', 'leaderboard'):
+        ranking_logic.render_leaderboard('project', display_df, summary.version, selected_category, expand_view)
@@ -0,0 +1,217 @@
+# ranking_logic.py
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import avatar_logic
+import perf_logic
+
+# ---------------------------------------------------------
+# [공통] 리더보드 HTML 렌더러 (팔로워 / 주급 / 플젝 페이지 공용)
+# ---------------------------------------------------------
+PROFILE_URL = "https://twitter.com/"
+CACHE_MAX_ENTRIES = 64
+PAGE_SIZE_OPTIONS = [50, 100, 200, 500]
+
+_cache_lock = threading.Lock()
+_html_cache = OrderedDict()
+
+
+# 1. 벡터화 문자열 유틸
+def clean_series(s):
+    # NaN / 'nan' / 공백 -> 빈 문자열
+    s = s.astype(object).where(s.notna(), "").astype(str).str.strip()
+    return s.mask(s.str.lower() == 'nan', "")
+
+
+def escape_series(s):
+    # html.escape(quote=True)와 동일한 치환을 컬럼 단위로 수행
+    return (
+        clean_series(s)
+        .str.replace('&', '&amp;', regex=False)
+        .str.replace('<', '&lt;', regex=False)
+        .str.replace('>', '&gt;', regex=False)
+        .str.replace('"', '&quot;', regex=False)
+        .str.replace("'", '&#x27;', regex=False)
+    )
+
+
+def medal_series(n, start=1):
+    ranks = np.arange(start, start + n)
+    medals = pd.Series(ranks.astype(str), dtype=object)
+    for rank, medal in ((1, "🥇"), (2, "🥈"), (3, "🥉")):
+        medals[ranks == rank] = medal
+    return medals
+
+
+def int_text(s):
+    return s.fillna(0).astype('int64').map('{:,}'.format).astype(object)
+
+
+def _wrap_if(content, prefix, suffix):
+    # 내용이 있을 때만 태그로 감쌈
+    return (prefix + content + suffix).where(content != "", "")
+
+
+# 2. 페이지별 행 템플릿 (summary + bio-box, <details> 태그 제외)
+#    df = 현재 페이지 구간, start = 구간 첫 행의 순위, full_df = 정렬된 전체 목록
+def _follower_rows(df, start, full_df):
+    handle = escape_series(df['handle'])
+    recent = escape_series(df['recent_interest']) if 'recent_interest' in df.columns else pd.Series("", index=df.index, dtype=object)
+    note = escape_series(df['note']) if 'note' in df.columns else pd.Series("", index=df.index, dtype=object)
+    bio = escape_series(df['bio']) if 'bio' in df.columns else pd.Series("", index=df.index, dtype=object)
+    bio = bio.mask(bio == "", "소개글이 없습니다.")
+
+    view_total = full_df['followers'].sum()
+    share = (df['followers'] / view_total * 100) if view_total > 0 else df['followers'] * 0
+    share_text = share.map('{:.1f}%'.format).astype(object)
+
+    return (
+        '<summary><div class="ranking-row">'
+        + '<div class="rank-col-1"><div class="rank-num">' + medal_series(len(df), start).values + '</div>'
+        + '<img src="' + avatar_logic.avatar_urls(df['handle']) + '" class="rank-img" onerror="this.style.display=\'none\'"></div>'
+        + '<div class="rank-info"><div class="rank-name">' + escape_series(df['name']) + '</div>'
+        + '<div class="rank-handle">@' + handle + '</div></div>'
+        + '<div class="rank-extra">'
+        + _wrap_if(recent, "<div class='rank-interest'>", "</div>")
+        + _wrap_if(note, "<span class='rank-note'>", "</span>")
+        + '</div>'
+        + '<div class="rank-stats-group"><div class="rank-category">' + escape_series(df['category']) + '</div>'
+        + '<div class="rank-share">' + share_text + '</div>'
+        + '<div class="rank-followers">' + int_text(df['followers']) + '</div></div>'
+        + '</div></summary>'
+        + '<div class="bio-box">'
+        + _wrap_if(recent, '<div style="margin-bottom: 12px;"><div class="bio-header" style="color: #D4E157;">📌 RECENT ACTIVITY</div><div class="bio-content" style="font-weight: 500; color: #FFFFFF;">', '</div></div>')
+        + '<div class="bio-header">📝 PROFILE BIO</div><div class="bio-content">' + bio + '</div>'
+        + '<a href="' + PROFILE_URL + handle + '" target="_blank" class="bio-link-btn">Visit Profile ↗</a>'
+        + '</div>'
+    )
+
+
+def _payout_rows(df, start, full_df):
+    handle = escape_series(df['handle'])
+    bio = escape_series(df['bio']) if 'bio' in df.columns else pd.Series("", index=df.index, dtype=object)
+    bio = bio.mask(bio == "", "수익 인증 상세 정보가 없습니다.")
+    followers = df['followers'] if 'followers' in df.columns else pd.Series(0, index=df.index)
+
+    return (
+        '<summary><div class="ranking-row">'
+        + '<div class="rank-col-1"><div class="rank-num">' + medal_series(len(df), start).values + '</div>'
+        + '<img src="' + avatar_logic.avatar_urls(df['handle']) + '" class="rank-img" onerror="this.style.display=\'none\'"></div>'
+        + '<div class="rank-info"><div class="rank-name">' + escape_series(df['name']) + '</div>'
+        + '<div class="rank-handle">@' + handle + '</div></div>'
+        + '<div class="rank-extra"></div>'
+        + '<div class="rank-stats-group" style="width: 200px;">'
+        + '<div class="rank-category" style="background-color: #1F2937; color: #9CA3AF;">👥 ' + int_text(followers) + '</div>'
+        + '<div class="rank-followers" style="width: 80px; color: #10B981;">$' + int_text(df['payout_amount']) + '</div></div>'
+        + '</div></summary>'
+        + '<div class="bio-box"><div class="bio-header">💰 PAYOUT INFO</div><div class="bio-content">' + bio + '</div>'
+        + '<a href="' + PROFILE_URL + handle + '" target="_blank" class="bio-link-btn">Visit Profile ↗</a>'
+        + '</div>'
+    )
+
+
+def _project_rows(df, start, full_df):
+    clean_id = escape_series(df['handle'].astype(str).str.replace('@', '', regex=False))
+    desc = escape_series(df['desc']) if 'desc' in df.columns else pd.Series("", index=df.index, dtype=object)
+    followers = int_text(df['followers'])
+    mindshare = df['mindshare'].astype(float)
+
+    return (
+        '<summary><div class="ranking-row">'
+        + '<div class="rank-col-1"><div class="rank-num">' + medal_series(len(df), start).values + '</div>'
+        + '<img src="' + avatar_logic.avatar_urls(df['handle']) + '" class="rank-img" onerror="this.style.display=\'none\'"></div>'
+        + '<div class="rank-info"><div class="rank-name">' + escape_series(df['real_name']) + '</div>'
+        + '<div class="rank-handle" style="font-size:11px; color:#9CA3AF;">' + escape_series(df['handle']) + '</div></div>'
+        + '<div class="rank-extra" style="display: block; white-space: normal; height: auto; padding: 4px 0;"><span class="rank-interest" style="font-weight:400; color:#D1D5DB !important; font-size:13px; line-height:1.4;">' + desc + '</span></div>'
+        + '<div class="rank-stats-group" style="width: 200px; display:flex; flex-direction:row; justify-content:flex-end; align-items:center; gap: 12px;">'
+        + '<div style="color:#6B7280; font-size:13px; font-weight:500; white-space:nowrap;">👥 ' + followers + '</div>'
+        + '<div style="color:#10B981; font-size:20px; font-weight:800; text-shadow: 0 0 5px rgba(16, 185, 129, 0.2);">' + mindshare.map('{:.1f}%'.format).astype(object) + '</div>'
+        + '</div></div></summary>'
+        + '<div class="bio-box"><div class="bio-header">📝 NOTE</div>'
+        + '<div class="bio-content">' + desc.mask(desc == "", "비고 없음") + '</div>'
+        + '<div style="margin-top:10px; font-size:12px; color:#6B7280;">• Followers: ' + followers + '<br>• Mindshare Score: ' + mindshare.map('{:.2f}%'.format).astype(object) + '</div>'
+        + '<a href="' + PROFILE_URL + clean_id + '" target="_blank" class="bio-link-btn">Visit Profile ↗</a>'
+        + '</div>'
+    )
+
+
+ROW_BUILDERS = {
+    'follower': _follower_rows,
+    'payout': _payout_rows,
+    'project': _project_rows,
+}
+
+
+# 3. 메모이제이션 (데이터 버전, 카테고리, 펼치기 여부, 보이는 구간의 썸네일 URL 단위)
+def _cache_get(key):
+    with _cache_lock:
+        if key in _html_cache:
+            _html_cache.move_to_end(key)
+            return _html_cache[key]
+    return None
+
+
+def _cache_put(key, value):
+    with _cache_lock:
+        _html_cache[key] = value
+        _html_cache.move_to_end(key)
+        while len(_html_cache) > CACHE_MAX_ENTRIES:
+            _html_cache.popitem(last=False)
+
+
+def render_ranking_html(page, ranking_df, version, category, expand_view, offset=0, limit=None):
+    # ranking_df는 이미 순위대로 정렬되어 있어야 함 (offset부터 limit개 행만 렌더링)
+    end = len(ranking_df) if limit is None else min(offset + limit, len(ranking_df))
+    # 보이는 구간의 썸네일 URL이 바뀔 때만 다시 생성 (다른 구간/페이지의 썸네일 도착은 영향 없음)
+    window_urls = avatar_logic.avatar_urls(ranking_df['handle'].iloc[offset:end]) if 'handle' in ranking_df.columns else ()
+    avatars = hashlib.sha1("\n".join(window_urls).encode()).hexdigest()
+    html_key = (page, version, category, offset, end, expand_view, avatars)
+    cached = _cache_get(html_key)
+    perf_logic.count_cache('leaderboard_html', cached is not None)
+    if cached is not None:
+        return cached
+
+    # 행 본문은 펼치기 여부와 무관하므로 따로 캐싱 -> 토글 시 join만 다시 수행
+    rows_key = (page, version, category, offset, end, avatars)
+    rows = _cache_get(rows_key)
+    if rows is None:
+        window_df = ranking_df.iloc[offset:end].reset_index(drop=True)
+        rows = ROW_BUILDERS[page](window_df, offset + 1, ranking_df).tolist() if not window_df.empty else []
+        _cache_put(rows_key, rows)
+
+    open_tag = '<details open>' if expand_view else '<details>'
+    list_html = (open_tag + ("</details>\n" + open_tag).join(rows) + "</details>") if rows else ""
+    _cache_put(html_key, list_html)
+    return list_html
+
+
+# 4. 페이지 단위 리더보드 (보이는 구간만 렌더링 -> 시트가 커져도 전송량 일정)
+# version은 ranking_df를 만든 데이터의 버전이어야 함 (get_version()으로 다시 읽으면 교체 직후 이전 행이 새 버전 키로 저장됨)
+def render_leaderboard(page, ranking_df, version, category, expand_view):
+    total_rows = len(ranking_df)
+    size_key, page_key, cat_key = f"{page}_page_size", f"{page}_page_no", f"{page}_page_category"
+
+    col_info, col_size, col_page = st.columns([0.6, 0.2, 0.2])
+    with col_size:
+        page_size = st.selectbox("표시 개수", PAGE_SIZE_OPTIONS, key=size_key)
+    n_pages = max(1, -(-total_rows // page_size))
+
+    # 카테고리가 바뀌었거나 범위를 벗어나면 1페이지로
+    if st.session_state.get(cat_key) != category or st.session_state.get(page_key, 1) > n_pages:
+        st.session_state[page_key] = 1
+    st.session_state[cat_key] = category
+
+    with col_page:
+        page_no = st.number_input("페이지", min_value=1, max_value=n_pages, step=1, key=page_key)
+    offset = (int(page_no) - 1) * page_size
+    with col_info:
+        st.write("")
+        st.caption(f"{offset + 1:,}–{min(offset + page_size, total_rows):,}위 / 전체 {total_rows:,}명")
+
+    list_html = render_ranking_html(page, ranking_df, version, category, expand_view, offset, page_size)
+    with st.container(height=600 if not expand_view else None):
+        st.markdown(list_html, unsafe_allow_html=True)
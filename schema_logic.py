@@ -0,0 +1,77 @@
+# schema_logic.py
+import pandas as pd
+import streamlit as st
+
+import perf_logic
+
+# ---------------------------------------------------------
+# [스키마] 워크시트별 컬럼 타입 (메모리 절약형)
+# ---------------------------------------------------------
+# category : 값 종류가 적은 컬럼 (카테고리 등) -> 코드 + 사전
+# text     : 일반 문자열 -> Arrow 문자열 (파이썬 객체 없이 연속 버퍼)
+# count    : 팔로워/언급 수 -> uint32 (최대 약 42억)
+# total    : 조회수처럼 커질 수 있는 합계 -> int64
+# amount   : 금액 (소수 가능) -> float64
+DTYPES = {
+    'category': 'category',
+    'text': 'string[pyarrow]',
+    'count': 'uint32',
+    'total': 'int64',
+    'amount': 'float64',
+}
+
+SCHEMAS = {
+    'main': {
+        'handle': 'text', 'name': 'text', 'followers': 'count', 'category': 'category',
+        'recent_interest': 'text', 'note': 'text',
+    },
+    'projects': {
+        'name': 'text', 'handle': 'text', 'join_key': 'text', 'desc': 'text', 'category': 'category',
+        'mentions': 'count', 'views': 'total',
+    },
+    'payouts': {
+        'handle': 'text', 'name': 'text', 'bio': 'text', 'category': 'category', 'payout_amount': 'amount',
+    },
+    'events': {
+        'event_name': 'text', 'prizes': 'text', 'deadline': 'text', 'announce_date': 'text', 'link': 'text',
+    },
+}
+
+
+# 1. 정제된 프레임을 스키마 타입으로 변환 (스키마에 없는 문자열 컬럼도 Arrow 문자열로)
+def compact(df, name):
+    schema = SCHEMAS.get(name, {})
+    dtypes = {}
+    for col in df.columns:
+        kind = schema.get(col)
+        if kind is None:
+            if pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col]):
+                kind = 'text'
+            else:
+                continue
+        if kind in ('count', 'total'):
+            # 음수/소수는 0 이상 정수로 정리한 뒤 변환
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).clip(lower=0).round()
+        elif kind == 'text':
+            df[col] = df[col].astype(object).where(df[col].notna(), "").astype(str)
+        dtypes[col] = DTYPES[kind]
+    return df.astype(dtypes)
+
+
+# 2. 공유 프레임을 세션에 넘기기 (얕은 사본: 버퍼는 공유, 컬럼 추가/교체는 사본에만 반영)
+def share(df):
+    return df.copy(deep=False)
+
+
+# 데이터 버전당 한 번만 만들어 모든 세션이 같은 버퍼를 공유 (st.cache_data처럼 매번 복제하지 않음)
+# 받는 쪽은 share()로 얕은 사본을 받아 쓰고, 원본 값을 제자리 수정하지 않음
+@st.cache_resource(max_entries=8)
+def _load_shared(name, version, _build):
+    return compact(_build(), name)
+
+
+def load_shared(name, version, _build):
+    built = []
+    df = _load_shared(name, version, lambda: built.append(True) or _build())
+    perf_logic.count_cache('shared_frames', not built)
+    return df
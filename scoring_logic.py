@@ -0,0 +1,113 @@
+# scoring_logic.py
+import threading
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# ---------------------------------------------------------
+# [설정] 마인드쉐어 점수 가중치 / 산식
+# ---------------------------------------------------------
+# secrets의 SCORE_WEIGHTS / SCORE_FUNCTION으로 덮어쓰기 가능
+SCORE_WEIGHTS = {'mentions': 40, 'views': 60}
+SCORE_FUNCTION = 'linear'
+INPUT_COLUMNS = list(SCORE_WEIGHTS)
+
+
+# 1. 정규화 산식 (컬럼별 0~1 값 반환, 행 단위로 독립 계산)
+def linear_terms(inputs, maxima):
+    return inputs / maxima
+
+
+def log_terms(inputs, maxima):
+    return np.log1p(inputs) / np.log1p(maxima)
+
+
+def sqrt_terms(inputs, maxima):
+    return np.sqrt(inputs) / np.sqrt(maxima)
+
+
+SCORERS = {'linear': linear_terms, 'log': log_terms, 'sqrt': sqrt_terms}
+
+
+def get_score_config():
+    weights, scorer = dict(SCORE_WEIGHTS), SCORE_FUNCTION
+    try:
+        weights.update(st.secrets.get("SCORE_WEIGHTS", {}))
+        scorer = st.secrets.get("SCORE_FUNCTION", scorer)
+    except Exception:
+        pass
+    return weights, scorer
+
+
+# 2. 점수 엔진 (시트 버전별 캐싱, 바뀐 행만 다시 계산)
+class ScoringEngine:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = {}    # scorer -> {'keys', 'inputs', 'maxima', 'terms'}
+        self._results = {}  # (version, scorer, weights) -> DataFrame
+        self.stats = {'full': 0, 'partial': 0, 'rows': 0}
+
+    def _terms(self, scorer, keys, inputs):
+        maxima = inputs.max(axis=0)
+        maxima[maxima == 0] = 1
+        fn = SCORERS[scorer]
+        prev = self._state.get(scorer)
+
+        if (prev is not None and np.array_equal(prev['keys'], keys)
+                and np.array_equal(prev['maxima'], maxima)):
+            # 정규화 기준(최댓값)이 그대로면 입력이 바뀐 행만 재계산
+            changed = np.flatnonzero((inputs != prev['inputs']).any(axis=1))
+            terms = prev['terms']
+            if len(changed):
+                terms = terms.copy()
+                terms[changed] = fn(inputs[changed], maxima)
+            self.stats['partial'] += 1
+            self.stats['rows'] += len(changed)
+        else:
+            terms = fn(inputs, maxima)
+            self.stats['full'] += 1
+            self.stats['rows'] += len(inputs)
+
+        self._state[scorer] = {'keys': keys, 'inputs': inputs, 'maxima': maxima, 'terms': terms}
+        return terms
+
+    def score(self, df, version, weights=None, scorer=None):
+        default_weights, default_scorer = get_score_config()
+        weights = weights or default_weights
+        scorer = scorer or default_scorer
+        cache_key = (version, scorer, tuple(sorted(weights.items())))
+
+        with self._lock:
+            if cache_key not in self._results:
+                inputs = df[INPUT_COLUMNS].to_numpy(dtype=float)
+                keys = df['join_key'].to_numpy() if 'join_key' in df.columns else np.arange(len(df))
+                terms = self._terms(scorer, keys, inputs)
+
+                # 가중치는 캐싱된 정규화 값에 곱하기만 하므로 바꿔도 입력 캐시는 유지
+                raw_score = terms @ np.array([weights.get(col, 0) for col in INPUT_COLUMNS], dtype=float)
+                total_score = raw_score.sum()
+                if total_score == 0: total_score = 1
+                self._results[cache_key] = pd.DataFrame({
+                    'raw_score': raw_score,
+                    'mindshare': (raw_score / total_score) * 100,
+                })
+                # 오래된 버전 결과는 정리
+                for key in [k for k in self._results if k[0] != version]:
+                    del self._results[key]
+            result = self._results[cache_key]
+
+        return result.set_axis(df.index)
+
+
+@st.cache_resource
+def get_scoring_engine():
+    return ScoringEngine()
+
+
+def apply_scores(df, version, weights=None, scorer=None):
+    scores = get_scoring_engine().score(df, version, weights, scorer)
+    df['raw_score'] = scores['raw_score']
+    df['mindshare'] = scores['mindshare']
+    # 트리맵 크기용
+    df['value'] = df['raw_score']
+    return df
@@ -0,0 +1,138 @@
+# sheets_logic.py
+import time
+import random
+import logging
+import threading
+from concurrent.futures import Future
+import pandas as pd
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# [시트 API] 호출 집계 / 속도 제한 / 재시도 / 동시 요청 합치기
+# ---------------------------------------------------------
+# Google Sheets 기본 할당량: 사용자당 분당 60회 읽기 -> 초당 1회, 순간 최대 10회
+RATE_PER_SECOND = 1.0
+BURST = 10
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0   # 초 (1, 2, 4, 8 ... x 0.5~1.5 무작위)
+BACKOFF_CAP = 30.0
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+COUNTER_KEYS = ['reads', 'writes', 'coalesced', 'retries', 'errors', 'fallbacks', 'wait_ms']
+
+
+# 1. 토큰 버킷 (초당 rate개 충전, 최대 capacity개 보관)
+class TokenBucket:
+    def __init__(self, rate=RATE_PER_SECOND, capacity=BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        # 토큰이 생길 때까지 대기, 기다린 시간(초) 반환
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+def is_retryable(error):
+    # 할당량 초과 / 일시적 서버 오류 / 네트워크 오류만 재시도
+    status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status is not None:
+        return status in RETRY_STATUS
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    message = str(error).lower()
+    return any(word in message for word in ('quota', 'rate limit', '429', 'timed out', 'unavailable'))
+
+
+# 2. 연결 래퍼 (프로세스당 1개)
+class SheetsClient:
+    def __init__(self, conn, bucket=None, max_retries=MAX_RETRIES, backoff_base=BACKOFF_BASE, backoff_cap=BACKOFF_CAP):
+        self.conn = conn
+        self.bucket = bucket or TokenBucket()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._lock = threading.Lock()
+        self._inflight = {}  # worksheet -> Future (같은 시트 동시 읽기는 한 번만 호출)
+        self._counters = {}
+
+    def _count(self, worksheet, key, amount=1):
+        with self._lock:
+            counters = self._counters.setdefault(worksheet or 'main', dict.fromkeys(COUNTER_KEYS, 0))
+            counters[key] += amount
+
+    def _call(self, worksheet, fn):
+        for attempt in range(self.max_retries + 1):
+            waited = self.bucket.acquire()
+            if waited: self._count(worksheet, 'wait_ms', int(waited * 1000))
+            try:
+                return fn()
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable(e):
+                    self._count(worksheet, 'errors')
+                    raise
+                delay = min(self.backoff_cap, self.backoff_base * 2 ** attempt) * random.uniform(0.5, 1.5)
+                self._count(worksheet, 'retries')
+                logger.warning("sheets call failed (%s), retry %d in %.1fs: %s", worksheet or 'main', attempt + 1, delay, e)
+                time.sleep(delay)
+
+    def read(self, worksheet=None, fallback=None):
+        with self._lock:
+            future = self._inflight.get(worksheet)
+            leader = future is None
+            if leader:
+                future = self._inflight[worksheet] = Future()
+        if not leader:
+            self._count(worksheet, 'coalesced')
+            return self._result(worksheet, future, fallback)
+
+        try:
+            self._count(worksheet, 'reads')
+            future.set_result(self._call(worksheet, lambda: self.conn.read(worksheet=worksheet, ttl=0)))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._inflight.pop(worksheet, None)
+        return self._result(worksheet, future, fallback)
+
+    def _result(self, worksheet, future, fallback):
+        try:
+            return future.result()
+        except Exception:
+            # 마지막 정상 데이터로 대체 (없으면 오류 그대로)
+            if fallback is None: raise
+            df = fallback()
+            if df is None: raise
+            self._count(worksheet, 'fallbacks')
+            return df
+
+    def update(self, worksheet=None, data=None):
+        # 쓰기는 합치지 않음 (호출마다 내용이 다름)
+        self._count(worksheet, 'writes')
+        return self._call(worksheet, lambda: self.conn.update(worksheet=worksheet, data=data))
+
+    def counter_table(self):
+        with self._lock:
+            rows = [{'worksheet': name, **counters} for name, counters in sorted(self._counters.items())]
+        return pd.DataFrame(rows, columns=['worksheet'] + COUNTER_KEYS)
+
+
+@st.cache_resource
+def get_client(_conn):
+    return SheetsClient(_conn)
@@ -0,0 +1,261 @@
+# snapshot_logic.py
+import os
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+
+import perf_logic
+import sheets_logic
+import loader_logic
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# [설정] 스냅샷 대상 워크시트 및 저장 위치
+# ---------------------------------------------------------
+SNAPSHOT_DIR = 'snapshots'
+REFRESH_SECONDS = 300  # 기본 갱신 주기 (5분)
+INITIAL_RETRY_SECONDS = 60  # 스냅샷이 없는 시트의 첫 읽기가 실패했을 때 갱신 스레드의 재시도 간격
+
+# 스냅샷 이름 -> 구글 시트 워크시트 (None = 메인 시트)
+WORKSHEETS = {
+    'main': None,
+    'projects': 'projects',
+    'payouts': 'payouts',
+    'events': 'events',
+    'visitors': 'visitors',
+}
+
+# 시트별 확인 주기 (초) - 내용이 바뀐 경우에만 새 버전으로 교체
+REFRESH_INTERVALS = {
+    'main': 600,
+    'projects': 300,
+    'payouts': 600,
+    'events': 600,
+    'visitors': 3600,  # 방문자 수는 visitor_logic이 직접 기록, 시작 시 한 번만 필요
+}
+
+VERSION_KEY = b'snapshot_version'
+HASH_KEY = b'snapshot_hash'
+
+_lock = threading.Lock()
+_frames = {}  # name -> (version, DataFrame)
+_hashes = {}  # name -> 내용 해시
+_checked = {}  # name -> 마지막 확인 시각
+_failed = {}  # name -> 스냅샷 없이 첫 읽기에 실패한 시각
+_prewarm = {}  # name -> 새 버전 교체 전에 파생 캐시를 미리 만드는 함수 (version, df)
+_flight = loader_logic.SingleFlight()
+
+
+def _snapshot_path(name):
+    return os.path.join(SNAPSHOT_DIR, f"{name}.arrow")
+
+
+# 1. 내용 해시 (컬럼 이름 + 값, 행 순서 포함)
+def content_hash(df):
+    digest = hashlib.sha256("\x1f".join(map(str, df.columns)).encode())
+    if len(df):
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+# 시트 -> Arrow 변환 (문자/숫자 섞인 컬럼은 문자열로 통일)
+def _to_table(df, version, digest=None):
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[VERSION_KEY] = version.encode()
+    if digest: metadata[HASH_KEY] = digest.encode()
+    return table.replace_schema_metadata(metadata)
+
+
+# 2. 스냅샷 저장 (임시 파일에 쓴 뒤 교체 -> 읽는 쪽은 항상 완전한 파일만 봄)
+def save_snapshot(name, df, digest=None):
+    version = str(time.time_ns())
+    table = _to_table(df, version, digest)
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    path = _snapshot_path(name)
+    tmp_path = f"{path}.tmp"
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+    return version
+
+
+# 3. 스냅샷 로드 (메모리 맵 -> 콜드 스타트에도 수 ms)
+def load_snapshot(name):
+    path = _snapshot_path(name)
+    if not os.path.exists(path):
+        return None, None, None
+    try:
+        source = pa.memory_map(path, 'r')
+        table = pa.ipc.open_file(source).read_all()
+        metadata = dict(table.schema.metadata or {})
+        version = metadata.pop(VERSION_KEY, b'').decode() or None
+        digest = metadata.pop(HASH_KEY, b'').decode() or None
+        return version, table.replace_schema_metadata(metadata).to_pandas(), digest
+    except Exception as e:
+        logger.warning("snapshot load failed (%s): %s", name, e)
+        return None, None, None
+
+
+# 4. 구글 시트에서 새로 가져와 내용이 바뀐 경우에만 스냅샷 교체
+#    (버전이 그대로면 정제/요약/트리맵/HTML 등 버전 키 캐시가 모두 유지됨)
+def _refresh_snapshot(conn, name):
+    with _lock:
+        current = _frames.get(name)
+    with perf_logic.stage('sheets', f"read:{name}"):
+        # 할당량/일시 오류는 sheets_logic에서 재시도, 끝내 실패하면 마지막 정상 스냅샷 유지
+        df = sheets_logic.get_client(conn).read(WORKSHEETS[name], fallback=(lambda: current[1]) if current else None)
+    if df is None:
+        return None
+    if current is not None and df is current[1]:
+        return current[0]
+    digest = content_hash(df)
+    with _lock:
+        _checked[name] = time.time()
+        if name in _frames and _hashes.get(name) == digest:
+            return _frames[name][0]
+    version = save_snapshot(name, df, digest)
+    # 교체 전에 정제/인덱스 캐시를 새 버전으로 미리 채움 -> 교체 직후 첫 사용자도 캐시 적중
+    if name in _prewarm:
+        try:
+            _prewarm[name](version, df)
+        except Exception as e:
+            logger.warning("snapshot prewarm failed (%s): %s", name, e)
+    with _lock:
+        _frames[name] = (version, df)
+        _hashes[name] = digest
+    logger.info("snapshot updated (%s): %s rows", name, len(df))
+    return version
+
+
+# 갱신 스레드 / 관리자 버튼 / 최초 로드가 겹쳐도 시트별로 한 번만 실행
+def refresh_snapshot(conn, name):
+    return _flight.do(('refresh', name), lambda: _refresh_snapshot(conn, name))
+
+
+def _ensure_loaded(conn, name):
+    with _lock:
+        if name in _frames:
+            return _frames[name]
+    # 콜드 스타트에 여러 세션이 동시에 들어와도 디스크/시트 로드는 한 번
+    return _flight.do(('load', name), lambda: _load(conn, name))
+
+
+def _load(conn, name):
+    with _lock:
+        if name in _frames:
+            return _frames[name]
+    version, df, digest = load_snapshot(name)
+    if df is None:
+        # 스냅샷이 한 번도 없었던 최초 기동만 시트를 직접 읽음
+        # 실패하면 재시도는 갱신 스레드에 맡기고, 페이지는 기다리지 않고 빈 프레임 반환
+        with _lock:
+            failed = name in _failed
+        if not failed:
+            try:
+                refresh_snapshot(conn, name)
+            except Exception as e:
+                logger.warning("initial fetch failed (%s): %s", name, e)
+            with _lock:
+                if name not in _frames:
+                    _failed[name] = time.time()
+    else:
+        with _lock:
+            if name not in _frames:
+                _frames[name] = (version, df)
+                _hashes[name] = digest
+    with _lock:
+        return _frames.get(name, (None, pd.DataFrame()))
+
+
+# 5. 백그라운드 갱신 스레드 (프로세스당 1개, 시트마다 자기 주기로 확인)
+def _refresh_loop(conn):
+    due = {name: time.time() + REFRESH_INTERVALS.get(name, REFRESH_SECONDS) for name in WORKSHEETS}
+    while True:
+        name = min(due, key=due.get)
+        time.sleep(max(0, due[name] - time.time()))
+        try:
+            refresh_snapshot(conn, name)
+        except Exception as e:
+            logger.warning("snapshot refresh failed (%s): %s", name, e)
+        with _lock:
+            loaded = name in _frames
+            if loaded: _failed.pop(name, None)
+        # 아직 한 번도 못 읽은 시트는 짧은 간격으로 다시 시도
+        due[name] = time.time() + (REFRESH_INTERVALS.get(name, REFRESH_SECONDS) if loaded else INITIAL_RETRY_SECONDS)
+
+
+@st.cache_resource
+def start_refresher(_conn):
+    thread = threading.Thread(target=_refresh_loop, args=(_conn,), name="snapshot-refresher", daemon=True)
+    thread.start()
+    return thread
+
+
+# 시작 시 일괄 로드 (시트마다 로드/파생 캐시 생성 시간 기록)
+def _prefetch(conn, name):
+    start = time.perf_counter()
+    version, df = _ensure_loaded(conn, name)
+    loaded = time.perf_counter()
+    if version is not None and name in _prewarm:
+        try:
+            _prewarm[name](version, df)
+        except Exception as e:
+            logger.warning("snapshot prewarm failed (%s): %s", name, e)
+    timing = {'load_ms': (loaded - start) * 1000, 'prewarm_ms': (time.perf_counter() - loaded) * 1000, 'rows': len(df)}
+    # 관리자 성능 패널에 표시 (로그는 기본 레벨에서 출력되지 않음)
+    perf_logic.record('prefetch', f"{name}:load", timing['load_ms'])
+    perf_logic.record('prefetch', f"{name}:prewarm", timing['prewarm_ms'])
+    logger.info("prefetch %s: load %.0f ms, prewarm %.0f ms, %d rows", name, timing['load_ms'], timing['prewarm_ms'], timing['rows'])
+    return name, timing
+
+
+@st.cache_resource
+def warm_up(_conn):
+    start_refresher(_conn)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(WORKSHEETS), thread_name_prefix="prefetch") as pool:
+        timings = dict(pool.map(lambda name: _prefetch(_conn, name), WORKSHEETS))
+    perf_logic.record('prefetch', 'total', (time.perf_counter() - start) * 1000)
+    logger.info("prefetch done: %.0f ms for %d sheets", (time.perf_counter() - start) * 1000, len(timings))
+    return timings
+
+
+# 6. 페이지에서 쓰는 읽기 함수 (시트 API를 기다리지 않음)
+def get_snapshot(conn, name):
+    start_refresher(conn)
+    return _ensure_loaded(conn, name)
+
+
+def get_version(conn, name):
+    return get_snapshot(conn, name)[0]
+
+
+def register_prewarm(name, build):
+    _prewarm[name] = build
+
+
+# 7. 관리자 화면용 상태 (버전, 갱신/확인 시각, 크기)
+def status(name):
+    with _lock:
+        version, df = _frames.get(name, (None, None))
+        checked = _checked.get(name)
+    return {
+        'version': version,
+        'updated': int(version) / 1e9 if version and version.isdigit() else None,
+        'checked': checked,
+        'rows': len(df) if df is not None else 0,
+        'bytes': int(df.memory_usage(deep=True).sum()) if df is not None else 0,
+    }
+
@@ -0,0 +1,92 @@
+# summary_logic.py
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import perf_logic
+
+# ---------------------------------------------------------
+# [요약 지표] 카테고리별 개수 / 합계 / 1위 / 정렬 순서를 한 번에 계산
+# ---------------------------------------------------------
+ALL_CATEGORY = "전체보기"
+
+
+class CategorySummary:
+    def __init__(self, df, metric, sum_columns=(), version=None):
+        self.metric = metric
+        self.version = version  # 이 요약을 만든 데이터 버전 (파생 캐시 키로 사용)
+        columns = [metric] + [c for c in sum_columns if c != metric]
+
+        # 지표 > 0 인 행만, 지표 내림차순으로 한 번만 정렬
+        ranked = df[df[metric] > 0].sort_values(metric, ascending=False, kind='stable')
+
+        # 카테고리(범주형 코드) 기준으로 한 번 더 안정 정렬 -> 카테고리별로 연속 구간 + 구간 안은 순위 순서
+        if 'category' in ranked.columns:
+            categories = ranked['category'].astype('category')
+            codes = categories.cat.codes.to_numpy()
+            names = list(categories.cat.categories)
+        else:
+            codes = np.zeros(len(ranked), dtype=np.int8)
+            names = []
+        order = np.argsort(codes, kind='stable')
+
+        # 카테고리 컬럼은 범주형 그대로 유지 (문자열로 되돌리지 않음)
+        if 'category' in ranked.columns:
+            ranked = ranked.assign(category=categories)
+        self.frame = ranked.iloc[order].reset_index(drop=True)
+        # 전체보기용: 원래 순위 순서 프레임도 한 번만 만들어 둠 (매 rerun마다 take로 복사하지 않음)
+        self.ranked = ranked.reset_index(drop=True)
+
+        # 카테고리 -> (시작, 끝) 행 구간
+        # (카테고리 없는 행은 코드 -1 이라 맨 앞에 모이므로 그만큼 건너뜀)
+        counts = np.bincount(codes[codes >= 0], minlength=len(names))
+        bounds = np.concatenate([[0], np.cumsum(counts)]) + np.count_nonzero(codes < 0)
+        self._ranges = {name: (int(bounds[i]), int(bounds[i + 1])) for i, name in enumerate(names)}
+        self._ranges[ALL_CATEGORY] = (0, len(self.frame))
+
+        # 카테고리별 합계 (단일 groupby) + 전체 합계
+        if names:
+            totals = self.frame.groupby('category', sort=False, observed=True)[columns].sum()
+        else:
+            totals = pd.DataFrame(columns=columns)
+        totals.loc[ALL_CATEGORY] = self.frame[columns].sum()
+        totals['count'] = pd.Series({cat: stop - start for cat, (start, stop) in self._ranges.items()})
+        self.table = totals
+
+    def count(self, category):
+        start, stop = self._ranges.get(category, (0, 0))
+        return stop - start
+
+    def total(self, category, column=None):
+        if category not in self.table.index: return 0
+        return self.table.at[category, column or self.metric]
+
+    def top(self, category):
+        if self.count(category) == 0: return None
+        if category == ALL_CATEGORY: return self.ranked.iloc[0]
+        return self.frame.iloc[self._ranges[category][0]]
+
+    def ranking(self, category):
+        # 카테고리는 연속 구간 슬라이스 (O(k), 마스크/재정렬 없음), 전체보기는 순위 순서 프레임 그대로
+        if category == ALL_CATEGORY:
+            return self.ranked
+        start, stop = self._ranges.get(category, (0, 0))
+        return self.frame.iloc[start:stop].reset_index(drop=True)
+
+
+# 페이지 + 데이터 버전당 한 번만 생성하고 세션 간 공유 (읽기 전용으로 사용)
+# _df 자리에 함수를 넘기면 캐시 미스일 때만 호출해 프레임을 만듦 (병합 등 사전 작업 생략용)
+@st.cache_resource(max_entries=6)
+def _get_category_summary(page, version, _df, metric, sum_columns=()):
+    df = _df() if callable(_df) else _df
+    return CategorySummary(df, metric, sum_columns, version)
+
+
+def get_category_summary(page, version, _df, metric, sum_columns=()):
+    built = []
+    def build():
+        built.append(True)
+        return _df() if callable(_df) else _df
+    summary = _get_category_summary(page, version, build, metric, sum_columns)
+    perf_logic.count_cache('category_summary', not built)
+    return summary
@@ -0,0 +1,6 @@
+# tests/conftest.py
+# 저장소 루트의 *_logic 모듈을 그대로 import (패키지 구조 없음)
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
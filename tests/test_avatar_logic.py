@@ -0,0 +1,101 @@
+# tests/test_avatar_logic.py
+# 썸네일 변환 / 디스크 용량 상한 / 실패 후 재시도 대기 (LocalFetcher로 네트워크 없이)
+import io
+import time
+
+import pandas as pd
+from PIL import Image
+
+import avatar_logic
+
+
+def write_image(directory, key, size=(200, 120), color=(200, 30, 30)):
+    Image.new('RGB', size, color).save(directory / f"{key}.png")
+
+
+def wait_idle(cache, timeout=10):
+    deadline = time.monotonic() + timeout
+    while cache.stats()['pending'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache.stats()['pending'] == 0
+
+
+class CountingFetcher(avatar_logic.LocalFetcher):
+    def __init__(self, directory):
+        super().__init__(str(directory))
+        self.calls = []
+
+    def fetch(self, key):
+        self.calls.append(key)
+        return super().fetch(key)
+
+
+def make_cache(tmp_path, fetcher, **kwargs):
+    return avatar_logic.AvatarCache(fetcher, directory=str(tmp_path / 'thumbs'), url_prefix="/thumbs/", **kwargs)
+
+
+def test_make_thumbnail_is_square_webp(tmp_path):
+    write_image(tmp_path, 'alice')
+    thumb = avatar_logic.make_thumbnail((tmp_path / 'alice.png').read_bytes(), size=80)
+    with Image.open(io.BytesIO(thumb)) as image:
+        assert image.format == 'WEBP'
+        assert image.size == (80, 80)
+
+
+def test_urls_placeholder_then_static_file(tmp_path):
+    write_image(tmp_path, 'alice')
+    cache = make_cache(tmp_path, avatar_logic.LocalFetcher(str(tmp_path)))
+    handles = pd.Series(['@Alice'])
+
+    assert cache.urls(handles).tolist() == [avatar_logic.PLACEHOLDER_URL]
+    wait_idle(cache)
+    url = cache.urls(handles).iloc[0]
+    assert url.startswith("/thumbs/alice.") and url.endswith(".webp")
+
+
+def test_lru_evicts_oldest_over_byte_cap(tmp_path):
+    keys = ['a1', 'b2', 'c3', 'd4']
+    for i, key in enumerate(keys):
+        write_image(tmp_path, key, color=(i * 60, 100, 200 - i * 40))
+    one = len(avatar_logic.make_thumbnail((tmp_path / 'a1.png').read_bytes()))
+    cache = make_cache(tmp_path, avatar_logic.LocalFetcher(str(tmp_path)), max_bytes=one * 2 + one // 2, max_workers=1)
+
+    for key in keys:
+        cache.urls(pd.Series([key]))
+        wait_idle(cache)
+
+    stats = cache.stats()
+    assert stats['bytes'] <= cache.max_bytes
+    assert stats['files'] == 2
+    # 먼저 받은 두 계정이 밀려남
+    urls = cache.urls(pd.Series(keys[2:])).tolist()
+    assert all(url.startswith("/thumbs/") for url in urls)
+    assert len(list((tmp_path / 'thumbs').iterdir())) == 2
+
+
+def test_failed_fetch_waits_for_retry_window(tmp_path):
+    fetcher = CountingFetcher(tmp_path)
+    cache = make_cache(tmp_path, fetcher)
+    handles = pd.Series(['missing'])
+
+    cache.urls(handles)
+    wait_idle(cache)
+    assert fetcher.calls == ['missing']
+    assert cache.stats()['failed'] == 1
+
+    # 재시도 대기 중에는 다시 요청하지 않음
+    assert cache.urls(handles).tolist() == [avatar_logic.PLACEHOLDER_URL]
+    wait_idle(cache)
+    assert fetcher.calls == ['missing']
+
+    # 대기 시간이 지나면 다시 시도 -> 원본이 생겼으면 성공
+    cache._failed['missing'] -= avatar_logic.RETRY_SECONDS + 1
+    write_image(tmp_path, 'missing')
+    cache.urls(handles)
+    wait_idle(cache)
+    assert fetcher.calls == ['missing', 'missing']
+    assert cache.urls(handles).iloc[0].startswith("/thumbs/missing.")
+
+
+def test_static_url_is_root_relative():
+    assert avatar_logic.static_url() == "/" + avatar_logic.STATIC_PATH
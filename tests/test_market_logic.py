@@ -0,0 +1,76 @@
+# tests/test_market_logic.py
+# 시세 엔진: 시간 초과 종목 처리 / 만료 후 이전 값 제공 (FixtureProvider, 네트워크 없음)
+import threading
+import time
+
+import history_logic
+import market_logic
+
+SYMBOLS = {'Gold': 'GC=F', 'Ethereum': 'ETH-USD'}
+
+
+class GatedProvider(market_logic.FixtureProvider):
+    # gate가 열릴 때까지 지정 종목 조회를 멈춤, 일봉 조회 횟수 기록
+    def __init__(self, slow=()):
+        super().__init__()
+        self.slow = set(slow)
+        self.gate = threading.Event()
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def history(self, ticker, period=None, start=None, interval="1d"):
+        if interval == '1d':
+            with self._lock: self.calls.append(ticker)
+        if ticker in self.slow:
+            self.gate.wait(10)
+        return super().history(ticker, period=period, start=start, interval=interval)
+
+
+def make_engine(tmp_path, provider, **kwargs):
+    store = history_logic.HistoryStore(str(tmp_path / 'history.db'))
+    return market_logic.MarketEngine(provider, SYMBOLS, store=store, **kwargs)
+
+
+def wait_until(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert condition()
+
+
+def test_timed_out_symbol_is_not_resubmitted_and_late_result_is_kept(tmp_path):
+    provider = GatedProvider(slow={'GC=F'})
+    engine = make_engine(tmp_path, provider, timeout=0.2, backfill_timeout=0.2)
+
+    rows = engine.refresh()
+    assert [row['Name'] for row in rows] == ['Ethereum']
+
+    # 아직 진행 중인 종목은 다시 요청하지 않음
+    engine.refresh()
+    assert provider.calls.count('GC=F') == 1
+    assert provider.calls.count('ETH-USD') == 2
+
+    # 늦게 끝난 결과도 반영됨
+    provider.gate.set()
+    wait_until(lambda: engine.status()['rows'] == 2)
+    assert sorted(row['Name'] for row in engine.refresh()) == ['Ethereum', 'Gold']
+    assert provider.calls.count('GC=F') == 2
+
+
+def test_expired_value_is_served_while_refreshing(tmp_path):
+    provider = GatedProvider()
+    engine = make_engine(tmp_path, provider, refresh_seconds=0.05, stale_seconds=60)
+    first = engine.snapshot()
+    assert len(first) == 2
+
+    # 만료 후: 갱신이 끝날 때까지 기다리지 않고 이전 값을 바로 반환
+    provider.slow = {'GC=F'}
+    time.sleep(0.1)
+    start = time.monotonic()
+    stale = engine.snapshot()
+    assert time.monotonic() - start < 0.5
+    assert stale.equals(first)
+    assert engine.status()['refreshing']
+
+    provider.gate.set()
+    wait_until(lambda: not engine.status()['refreshing'])
@@ -0,0 +1,32 @@
+# ticker_logic.py
+import streamlit as st
+import ranking_logic
+
+MAX_TICKER_ITEMS = 300  # 애니메이션에 넘기는 항목 수 상한
+
+DEFAULT_MESSAGES = [
+    "🚀 <span class='ticker-highlight'>Raoni Map</span>에 오신 것을 환영합니다.",
+    "📢 트위터 팔로워 데이터는 매일 업데이트 됩니다.",
+    "💰 주급 맵에서 최신 수익 인증 내역을 확인하세요."
+]
+
+
+# 데이터 버전별로 한 번만 생성 (rerun마다 다시 만들지 않음)
+@st.cache_data(max_entries=2)
+def build_ticker_items(version, _df):
+    messages = []
+    if not _df.empty and 'recent_interest' in _df.columns:
+        interest = ranking_logic.escape_series(_df['recent_interest'])
+        valid = interest != ""
+        valid_df = _df[valid].head(MAX_TICKER_ITEMS)
+        interest = interest[valid].head(MAX_TICKER_ITEMS)
+        messages = (
+            "<span class='ticker-highlight'>" + ranking_logic.escape_series(valid_df['name'])
+            + "</span> <span class='ticker-handle'>(@" + ranking_logic.escape_series(valid_df['handle'])
+            + ")</span> " + interest
+        ).tolist()
+
+    if not messages:
+        messages = DEFAULT_MESSAGES
+
+    return "".join([f'<div class="ticker-item">{msg}</div>' for msg in messages])
@@ -0,0 +1,179 @@
+# treemap_logic.py
+import json
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+import perf_logic
+import loader_logic
+
+# ---------------------------------------------------------
+# [공통] 트리맵 색상 / 라벨 / figure 캐시
+# ---------------------------------------------------------
+COLOR_SCALE = [(0.00, '#2E2B4E'), (0.05, '#353263'), (0.10, '#3F3C5C'), (0.15, '#464282'), (0.20, '#4A477A'), (0.25, '#4A5D91'), (0.30, '#4A6FA5'), (0.35, '#537CA8'), (0.40, '#5C8BAE'), (0.45, '#5C98AE'), (0.50, '#5E9CA8'), (0.55, '#5E9E94'), (0.60, '#5F9E7F'), (0.65, '#729E6F'), (0.70, '#859E5F'), (0.75, '#969E5F'), (0.80, '#A89E5F'), (0.85, '#AD905D'), (0.90, '#AE815C'), (0.95, '#AE6E5C'), (1.00, '#AE5C5C')]
+FIGURE_CACHE_MAX_ENTRIES = 32
+TREEMAP_TOP_N = 300  # 그룹별 최대 칸 수 (나머지는 '기타'로 합침, 0 = 전부 표시)
+OTHERS_LABEL = "기타 (Others)"
+
+_cache_lock = threading.Lock()
+_figure_cache = OrderedDict()  # (page, version, category, merge) -> figure JSON
+_flight = loader_logic.SingleFlight()
+
+
+# 1. 차트 라벨 (행 단위 apply 대신 컬럼 연결)
+def label_series(title, subtitle, font_size='0.7em'):
+    return (
+        title.astype(str) + f"<br><span style='font-size:{font_size}; font-weight:normal;'>"
+        + subtitle.astype(str) + "</span>"
+    )
+
+
+def get_top_n():
+    try:
+        return int(st.secrets.get("TREEMAP_TOP_N", TREEMAP_TOP_N))
+    except Exception:
+        return TREEMAP_TOP_N
+
+
+# 2. figure 캐시 (직렬화된 JSON 보관 -> 캐시 적중 시 plotly express 재생성 없음, build는 캐시 미스일 때만 호출)
+def get_figure(key, build):
+    with _cache_lock:
+        cached = _figure_cache.get(key)
+        if cached is not None:
+            _figure_cache.move_to_end(key)
+    perf_logic.count_cache('treemap_figure', cached is not None)
+    if cached is None:
+        # 같은 figure를 여러 세션이 동시에 요청하면 한 번만 생성
+        cached = _flight.do(key, lambda: _build_and_store(key, build))
+    # st.plotly_chart는 dict도 그대로 받음
+    return json.loads(cached)
+
+
+def _build_and_store(key, build):
+    with _cache_lock:
+        if key in _figure_cache:
+            return _figure_cache[key]
+    cached = build().to_json()
+    with _cache_lock:
+        _figure_cache[key] = cached
+        _figure_cache.move_to_end(key)
+        while len(_figure_cache) > FIGURE_CACHE_MAX_ENTRIES:
+            _figure_cache.popitem(last=False)
+    return cached
+
+
+# 3. 2단계(그룹 -> 계정) 트리맵 직접 생성 (plotly express 계층 계산 생략)
+#    px.treemap(path=[그룹, 계정], values=, color=, custom_data=)와 같은 ids/parents/values/색상을 만듦
+def _uniform_or_unknown(column, codes, n_groups):
+    # 그룹 내 값이 모두 같으면 그 값, 아니면 px와 같이 '(?)'
+    value_codes, uniques = pd.factorize(pd.Series(column, dtype=object), use_na_sentinel=False)
+    lo = np.full(n_groups, np.iinfo(np.int64).max)
+    hi = np.full(n_groups, -1)
+    np.minimum.at(lo, codes, value_codes)
+    np.maximum.at(hi, codes, value_codes)
+    out = np.asarray(uniques, dtype=object)[lo]
+    out[lo != hi] = "(?)"
+    return out
+
+
+def _collapse_tail(groups, labels, values, color, custom, top_n):
+    # 그룹마다 값 상위 top_n개만 남기고 나머지는 그룹별 '기타' 칸 하나로 합산
+    group_codes, group_uniques = pd.factorize(pd.Series(groups, dtype=object))
+    keep, others = [], []
+    for code in range(len(group_uniques)):
+        idx = np.flatnonzero(group_codes == code)
+        if len(idx) <= top_n:
+            keep.append(idx)
+            continue
+        top = np.argpartition(-values[idx], top_n - 1)[:top_n]
+        rest = np.delete(idx, top)
+        keep.append(idx[top])
+        others.append((group_uniques[code], rest))
+
+    if not others:
+        return groups, labels, values, color, custom
+
+    keep = np.concatenate(keep)
+    o_groups, o_labels, o_values, o_color, o_custom = [], [], [], [], []
+    for group, rest in others:
+        total = values[rest].sum()
+        o_groups.append(group)
+        o_labels.append(f"{OTHERS_LABEL} {len(rest):,}")
+        o_values.append(total)
+        o_color.append((color[rest] * values[rest]).sum() / total if total > 0 else color[rest].mean())
+        row = []
+        for i in range(custom.shape[1]):
+            column = pd.to_numeric(pd.Series(custom[rest, i]), errors='coerce')
+            # 숫자 컬럼은 합계, 문자 컬럼은 '기타' 라벨
+            row.append(column.sum() if column.notna().all() else o_labels[-1])
+        o_custom.append(row)
+
+    return (
+        np.concatenate([groups[keep], np.asarray(o_groups, dtype=object)]),
+        np.concatenate([labels[keep], np.asarray(o_labels, dtype=object)]),
+        np.concatenate([values[keep], o_values]),
+        np.concatenate([color[keep], o_color]),
+        np.concatenate([custom[keep], np.asarray(o_custom, dtype=object).reshape(len(others), custom.shape[1])]),
+    )
+
+
+def two_level_treemap(groups, labels, values, color, custom_data=None, color_scale=COLOR_SCALE,
+                      color_midpoint=None, hovertemplate=None, top_n=None):
+    # groups에 문자열 하나를 주면 전체를 한 그룹으로 묶음 (통합 보기)
+    values = np.asarray(values, dtype=float)
+    groups = np.full(len(values), groups, dtype=object) if np.ndim(groups) == 0 else np.asarray(groups, dtype=object)
+    groups = groups.astype(str)
+    labels = np.asarray(labels, dtype=object).astype(str)
+    color = np.asarray(color, dtype=float)
+    custom = np.empty((len(values), 0), dtype=object) if custom_data is None else np.asarray(custom_data, dtype=object).reshape(len(values), -1)
+
+    # (그룹, 계정)이 중복되면 px와 같이 하나의 칸으로 합산
+    leaf_ids = pd.Series(groups, dtype=object) + "/" + pd.Series(labels, dtype=object)
+    leaf_codes, leaf_uniques = pd.factorize(leaf_ids)
+    if len(leaf_uniques) < len(values):
+        first = np.unique(leaf_codes, return_index=True)[1]
+        leaf_values = np.bincount(leaf_codes, weights=values)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            leaf_color = np.bincount(leaf_codes, weights=color * values) / leaf_values
+        leaf_color = np.where(leaf_values > 0, leaf_color, color[first])
+        groups, labels, custom = groups[first], labels[first], custom[first]
+        values, color = leaf_values, leaf_color
+    # 칸이 너무 많으면 그룹별 상위 top_n만 그리고 꼬리는 '기타'로 (그룹 합계는 그대로)
+    if top_n:
+        groups, labels, values, color, custom = _collapse_tail(groups, labels, values, color, custom, top_n)
+        leaf_uniques = pd.Series(groups, dtype=object) + "/" + pd.Series(labels, dtype=object)
+    leaf_ids = np.asarray(leaf_uniques, dtype=object)
+
+    # 그룹 칸: 값 합계, 색상은 값 가중 평균
+    group_codes, group_uniques = pd.factorize(pd.Series(groups, dtype=object))
+    group_ids = np.asarray(group_uniques, dtype=object)
+    group_values = np.bincount(group_codes, weights=values)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        group_color = np.bincount(group_codes, weights=color * values) / group_values
+    group_color = np.where(group_values > 0, group_color, np.bincount(group_codes, weights=color) / np.bincount(group_codes))
+
+    group_custom = np.empty((len(group_ids), custom.shape[1]), dtype=object)
+    for i in range(custom.shape[1]):
+        group_custom[:, i] = _uniform_or_unknown(custom[:, i], group_codes, len(group_ids))
+
+    trace = go.Treemap(
+        ids=np.concatenate([leaf_ids, group_ids]),
+        labels=np.concatenate([labels, group_ids]),
+        parents=np.concatenate([groups, np.full(len(group_ids), "", dtype=object)]),
+        values=np.concatenate([values, group_values]),
+        branchvalues='total',
+        marker=dict(colors=np.concatenate([color, group_color]), coloraxis='coloraxis'),
+        customdata=np.concatenate([custom, group_custom]) if custom.shape[1] else None,
+        hovertemplate=hovertemplate,
+    )
+    fig = go.Figure(trace)
+    fig.update_layout(
+        template="plotly_dark",
+        coloraxis=dict(colorscale=color_scale, cmid=color_midpoint),
+        legend=dict(tracegroupgap=0),
+        margin=dict(t=60),
+    )
+    return fig
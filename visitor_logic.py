@@ -1,62 +1,182 @@
 # visitor_logic.py
+import time
+import atexit
+import logging
+import threading
 import streamlit as st
 from datetime import datetime, timedelta, timezone
 
-# 1. 방문자 수 카운트 및 업데이트 로직
-def update_visitor_count(conn):
+import snapshot_logic
+import sheets_logic
+
+logger = logging.getLogger(__name__)
+
+KST = timezone(timedelta(hours=9))
+FLUSH_SECONDS = 60  # 누적된 방문 수를 시트에 기록하는 주기
+LOAD_RETRY_SECONDS = 300  # 시트 읽기/헤더 오류 후 시트를 다시 가져와 보는 간격
+
+
+def _today_kst():
+    return datetime.now(KST).strftime("%Y-%m-%d")
+
+
+def _parse_visitor_sheet(v_df):
+    # 시트 첫 행에서 (total, today, last_date) 추출
+    if v_df is None or v_df.empty:
+        raise ValueError("❌ 'visitors' 시트 비어있음")
+
+    required_cols = {'total', 'today', 'last_date'}
+    if not required_cols.issubset(v_df.columns):
+        raise ValueError(f"❌ 헤더 오류! 필요: {required_cols}")
+
     try:
-        # 캐시 없이 즉시 읽기
-        v_df = conn.read(worksheet="visitors", ttl=0)
-        
-        # 데이터 검증
-        if v_df.empty:
-            st.sidebar.error("❌ 'visitors' 시트 비어있음")
-            return 0, 0
-        
-        required_cols = {'total', 'today', 'last_date'}
-        if not required_cols.issubset(v_df.columns):
-            st.sidebar.error(f"❌ 헤더 오류! 필요: {required_cols}")
-            return 0, 0
-            
+        total = int(str(v_df.iloc[0]['total']).replace(',', '').split('.')[0])
+        today = int(str(v_df.iloc[0]['today']).replace(',', '').split('.')[0])
+    except ValueError:
+        raise ValueError("❌ 'visitors' 시트 숫자 오류! total / today 칸에 숫자만 입력") from None
+    stored_date = str(v_df.iloc[0]['last_date']).strip()
+    return total, today, stored_date
+
+
+# 1. 프로세스 내 방문자 카운터 (증가는 메모리에서, 기록은 주기적으로 한 번에)
+class VisitorCounter:
+    def __init__(self, conn):
+        self._conn = conn
+        self._lock = threading.Lock()
+        self.total = 0
+        self.today = 0
+        self.date = _today_kst()
+        self.error = None
+        self.loaded = False
+        self._failed_version = None  # 읽기에 실패한 스냅샷 버전 (버전이 바뀌면 바로 재시도)
+        self._retry_at = 0.0
+        # 아직 시트에 기록되지 않은 증가분
+        self._pending_total = 0
+        self._pending_today = 0
+
+    def _rollover(self):
+        # 한국 시간 기준 날짜가 바뀌면 Today 리셋
+        today_str = _today_kst()
+        if self.date != today_str:
+            self.date = today_str
+            self.today = 0
+            self._pending_today = 0
+
+    def load(self, refresh=False):
+        version = None
+        try:
+            if refresh:
+                snapshot_logic.refresh_snapshot(self._conn, 'visitors')
+            version, v_df = snapshot_logic.get_snapshot(self._conn, 'visitors')
+            total, today, stored_date = _parse_visitor_sheet(v_df)
+        except Exception as e:
+            self.error = str(e) if isinstance(e, ValueError) else None
+            self._failed_version = version
+            self._retry_at = time.time() + LOAD_RETRY_SECONDS
+            return
+        with self._lock:
+            self.total = total + self._pending_total
+            self.today = (today if stored_date == self.date else 0) + self._pending_today
+            self._rollover()
+            self.error = None
+            self.loaded = True
+
+    def retry_load(self, refresh=False):
+        # 시작 시 읽기에 실패했으면 다시 시도
+        # 스냅샷이 새 버전이면 (관리자 동기화 / 백그라운드 갱신) 바로, 아니면 대기 시간이 지난 뒤 시트를 새로 가져와서
+        if self.loaded:
+            return
+        if snapshot_logic.get_version(self._conn, 'visitors') != self._failed_version:
+            self.load()
+        elif refresh and time.time() >= self._retry_at:
+            self.load(refresh=True)
+
+    def increment(self):
+        with self._lock:
+            self._rollover()
+            self.total += 1
+            self.today += 1
+            self._pending_total += 1
+            self._pending_today += 1
+
+    def values(self):
+        with self._lock:
+            self._rollover()
+            return self.total, self.today
+
+    def flush(self):
+        with self._lock:
+            self._rollover()
+            delta_total, delta_today = self._pending_total, self._pending_today
+            self._pending_total = self._pending_today = 0
+        if delta_total == 0:
+            return
+
         try:
-            current_total = int(str(v_df.iloc[0]['total']).replace(',', '').split('.')[0])
-            current_today = int(str(v_df.iloc[0]['today']).replace(',', '').split('.')[0])
-            stored_date = str(v_df.iloc[0]['last_date']).strip()
-        except Exception:
-            return 0, 0
-        
-        # 날짜 확인 (한국 시간)
-        kst = timezone(timedelta(hours=9))
-        today_str = datetime.now(kst).strftime("%Y-%m-%d")
-        
-        need_update = False
-        
-        # 날짜 변경 시 Today 리셋
-        if stored_date != today_str:
-            current_today = 0
-            v_df.at[0, 'today'] = 0
-            v_df.at[0, 'last_date'] = today_str
-            need_update = True
-        
-        # 세션 체크 후 카운트 증가
-        if 'visit_counted' not in st.session_state:
-            current_total += 1
-            current_today += 1
-            v_df.at[0, 'total'] = current_total
-            v_df.at[0, 'today'] = current_today
-            need_update = True
-            st.session_state['visit_counted'] = True
-        
-        # 변경사항 저장
-        if need_update:
-            conn.update(worksheet="visitors", data=v_df)
-            
-        return current_total, current_today
-        
-    except Exception:
+            # 시트의 최신 값(다른 프로세스 반영분 포함)에 누적분을 더해 한 번에 기록
+            client = sheets_logic.get_client(self._conn)
+            v_df = client.read("visitors")
+            total, today, stored_date = _parse_visitor_sheet(v_df)
+            v_df = v_df.astype(object)
+            with self._lock:
+                if stored_date != self.date:
+                    today = 0
+                v_df.at[0, 'total'] = total + delta_total
+                v_df.at[0, 'today'] = today + delta_today
+                v_df.at[0, 'last_date'] = self.date
+            client.update("visitors", data=v_df)
+        except Exception as e:
+            # 실패한 증가분은 다음 주기에 다시 기록
+            with self._lock:
+                self._pending_total += delta_total
+                self._pending_today += delta_today
+            logger.warning("visitor flush failed: %s", e)
+            return
+
+        with self._lock:
+            self.total = total + delta_total + self._pending_total
+            self.today = today + delta_today + self._pending_today
+            # 시트를 정상적으로 읽고 썼으므로 시작 시 오류는 해소됨
+            self.error = None
+            self.loaded = True
+
+
+def _flush_loop(counter):
+    while True:
+        time.sleep(FLUSH_SECONDS)
+        counter.retry_load(refresh=True)
+        counter.flush()
+
+
+@st.cache_resource
+def get_visitor_counter(_conn):
+    counter = VisitorCounter(_conn)
+    counter.load()
+    thread = threading.Thread(target=_flush_loop, args=(counter,), name="visitor-flusher", daemon=True)
+    thread.start()
+    # 종료 시 아직 기록되지 않은 증가분을 마지막으로 기록 (실패해도 종료는 계속)
+    atexit.register(counter.flush)
+    return counter
+
+
+# 2. 방문자 수 카운트 (세션당 1회, 시트 호출 없음)
+def update_visitor_count(conn):
+    counter = get_visitor_counter(conn)
+    counter.retry_load()
+    if counter.error:
+        st.sidebar.error(counter.error)
+        return 0, 0
+
+    if 'visit_counted' not in st.session_state:
+        counter.increment()
+        st.session_state['visit_counted'] = True
+
+    # 시트를 아직 못 읽었으면 (네트워크/API 오류) 이 프로세스의 증가분만 있으므로 표시하지 않음
+    if not counter.loaded:
         return 0, 0
+    return counter.values()
 
-# 2. 사이드바에 방문자 박스 그리기
+# 3. 사이드바에 방문자 박스 그리기
 def display_visitor_widget(total, today):
     st.markdown(f"""
         <div class="visitor-box">